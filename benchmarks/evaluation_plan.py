@@ -0,0 +1,59 @@
+"""
+Compares per-call overhead of evaluating data providers recursively (Operation.evaluate)
+with running them as a compiled EvaluationPlan.
+
+    python -m benchmarks.evaluation_plan
+"""
+import timeit
+
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import DashInput, EvaluationContext, data_provider, evaluate_all
+from simpledash.data.plan import EvaluationPlan
+
+input_a = Input('a', 'value')
+input_b = Input('b', 'value')
+
+
+def deep_chain(depth):
+    provider = DashInput(input_a)
+    for _ in range(depth):
+        provider = provider['x']
+    nested = 1
+    for _ in range(depth):
+        nested = {'x': nested}
+    return [provider], {input_a: nested, input_b: 0}
+
+
+def wide_figure(width):
+    @data_provider(input_a, input_b)
+    def frame(a, b):
+        return {'column_{}'.format(i): [a, b, i] for i in range(width)}
+
+    return [frame['column_{}'.format(i)][DashInput(input_b)] for i in range(width)], {input_a: 1, input_b: 0}
+
+
+def measure(name, data_providers, inputs, number=2000):
+    plan = EvaluationPlan(data_providers)
+    compiled = min(timeit.repeat(lambda: plan.run(inputs), number=number, repeat=5)) / number
+    try:
+        recursive = min(timeit.repeat(lambda: evaluate_all(data_providers, EvaluationContext(inputs)),
+                                      number=number, repeat=5)) / number
+    except RecursionError:
+        print("{:<20} {:>15} {:>12.2f} us".format(name, "RecursionError", compiled * 1e6))
+        return
+    print("{:<20} {:>12.2f} us {:>12.2f} us {:>8.1f}x".format(
+        name, recursive * 1e6, compiled * 1e6, recursive / compiled))
+
+
+def main():
+    print("{:<20} {:>15} {:>15} {:>9}".format("case", "recursive", "compiled", "speedup"))
+    measure("chain, depth 10", *deep_chain(10))
+    measure("chain, depth 100", *deep_chain(100))
+    measure("chain, depth 500", *deep_chain(500), number=200)
+    measure("figure, 5 traces", *wide_figure(5))
+    measure("figure, 50 traces", *wide_figure(50), number=500)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Measures how long setup_callbacks takes for large, generated layouts.
+
+    python -m benchmarks.layout_scanning
+"""
+import time
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import Input
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.data.data_providers import DashInput
+
+
+def generated_layout(size, fan_out=10):
+    """
+    Layout of `size` components: a tree of divs, every tenth component being a graph using a data provider
+    """
+    components = []
+    for i in range(size):
+        if i % 10 == 0:
+            components.append(dcc.Graph(id='graph-{}'.format(i), figure={'data': [
+                {'x': DashInput(Input('input', 'value'))['x'], 'y': Input('input', 'value'), 'mode': 'markers'}
+            ]}))
+        else:
+            components.append(html.Div(id='div-{}'.format(i)))
+    while len(components) > 1:
+        components = [html.Div(components[i:i + fan_out]) for i in range(0, len(components), fan_out)]
+    return components[0]
+
+
+def main():
+    for size in (10000, 100000):
+        layout = generated_layout(size)
+        start = time.perf_counter()
+        setup_callbacks(Mock(), layout)
+        print("{:>7} components: {:.2f} s".format(size, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
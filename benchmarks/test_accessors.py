@@ -0,0 +1,43 @@
+import pytest
+
+from simpledash.inspector.accessors import NestedAccessor, KeyAccessor, TupleAccessor, set_all
+
+
+def nested_figure(depth):
+    figure = {'x': [0] * 1000}
+    path = []
+    for i in range(depth):
+        if i % 3 == 2:
+            figure = ('marker', figure)
+            path.append(TupleAccessor(1))
+        else:
+            figure = {'data': [figure, {'other': i}]}
+            path.append(KeyAccessor(0))
+            path.append(KeyAccessor('data'))
+    path.reverse()
+    return figure, NestedAccessor.from_list(path + [KeyAccessor('x')])
+
+
+@pytest.mark.parametrize("depth", [3, 30])
+def test_nested_accessor_set(benchmark, depth):
+    figure, accessor = nested_figure(depth)
+    benchmark(accessor.set, figure, [1] * 1000)
+
+
+def test_tuple_accessor_set(benchmark):
+    accessor = TupleAccessor(50)
+    value = tuple(range(100))
+    benchmark(accessor.set, value, 'x')
+
+
+def test_set_all_figure_values(benchmark):
+    figure = {'data': [{'x': None, 'y': None, 'customdata': None, 'marker': {'color': None, 'size': None}}]}
+    paths = [['x'], ['y'], ['customdata'], ['marker', 'color'], ['marker', 'size']]
+    accessors = [NestedAccessor.from_list([KeyAccessor(key) for key in ['data', 0] + path]) for path in paths]
+    benchmark(set_all, figure, accessors, [[1] * 1000] * len(accessors))
+
+
+def test_set_all_tuple_items(benchmark):
+    layout = {'children': tuple(range(100))}
+    accessors = [NestedAccessor.from_list([KeyAccessor('children'), TupleAccessor(i)]) for i in range(0, 100, 10)]
+    benchmark(set_all, layout, accessors, list(range(len(accessors))))
@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.evaluation_plan import deep_chain, wide_figure
+from simpledash.data.data_providers import EvaluationContext, evaluate_all
+from simpledash.data.plan import EvaluationPlan
+
+
+@pytest.mark.parametrize("depth", [10, 100])
+def test_evaluate_deep_chain(benchmark, depth):
+    data_providers, inputs = deep_chain(depth)
+    benchmark(lambda: evaluate_all(data_providers, EvaluationContext(inputs)))
+
+
+@pytest.mark.parametrize("width", [5, 50])
+def test_evaluate_wide_figure(benchmark, width):
+    data_providers, inputs = wide_figure(width)
+    benchmark(lambda: evaluate_all(data_providers, EvaluationContext(inputs)))
+
+
+@pytest.mark.parametrize("depth", [10, 100, 1000])
+def test_run_plan_of_deep_chain(benchmark, depth):
+    data_providers, inputs = deep_chain(depth)
+    benchmark(EvaluationPlan(data_providers).run, inputs)
+
+
+@pytest.mark.parametrize("width", [5, 50])
+def test_run_plan_of_wide_figure(benchmark, width):
+    data_providers, inputs = wide_figure(width)
+    benchmark(EvaluationPlan(data_providers).run, inputs)
@@ -0,0 +1,66 @@
+"""
+End-to-end execution of generated callbacks, with data providers built the same way as in the estate example
+"""
+from pathlib import Path
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+import pandas
+import pytest
+from dash.dependencies import Input
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.data.data_providers import data_provider
+
+flats = pandas.read_csv(Path(__file__).parent.parent / "examples" / "estate" / "flats.csv")
+flats = pandas.concat([flats] * 200, ignore_index=True)  # 100k rows
+
+
+@data_provider(Input('type_filter', 'value'))
+def flats_by_availability(required_availability):
+    if required_availability == 'All':
+        return flats
+    return flats[flats['is_available'] == (required_availability == 'Only available')]
+
+
+@data_provider(flats_by_availability, Input('areafilter', 'value'), Input('pricefilter', 'value'))
+def flats_to_display(df, area_filter_value, price_filter_value):
+    df = df[df['area'].between(area_filter_value[0], area_filter_value[1])]
+    df = df[df['rent_price'].between(price_filter_value[0], price_filter_value[1])]
+    return df
+
+
+def estate_layout():
+    return html.Div([
+        dcc.Graph(id='relation-plot', figure=dict(data=[dict(
+            x=flats_to_display[Input('x-column-chooser', 'value')],
+            y=flats_to_display[Input('y-column-chooser', 'value')],
+            customdata=flats_to_display.index,
+            mode='markers'
+        )])),
+        dcc.Graph(id='map', figure={'data': [{
+            'lat': flats_to_display['latitude'],
+            'lon': flats_to_display['longitude'],
+            'marker': {'color': flats_to_display[Input('color-chooser', 'value')]},
+            'customdata': flats_to_display.index,
+            'type': 'scattermapbox'
+        }]})
+    ], id='layout')
+
+
+def map_callback(**options):
+    app = Mock()
+    setup_callbacks(app, estate_layout(), **options)
+    return app.callback.return_value.call_args_list[-1][0][0]
+
+
+@pytest.mark.parametrize("compile_plans", [False, True])
+def test_execute_map_callback(benchmark, compile_plans):
+    execute = map_callback(compile_plans=compile_plans)
+    figure = {'data': [{'lat': None, 'lon': None, 'marker': {'color': None}, 'customdata': None}]}
+
+    # inputs are sorted by component id: areafilter, color-chooser, pricefilter, type_filter
+    result = benchmark(execute, (30, 60), 'rent_price', (1000, 3000), 'All', figure)
+
+    assert len(result['data'][0]['lat']) > 0
@@ -0,0 +1,17 @@
+from unittest.mock import Mock
+
+import pytest
+
+from benchmarks.layout_scanning import generated_layout
+from simpledash.callbacks import setup_callbacks
+
+
+@pytest.mark.parametrize("size", [1000, 10000])
+@pytest.mark.parametrize("fan_out", [2, 10, 100])
+def test_setup_callbacks(benchmark, size, fan_out):
+    # setup_callbacks modifies the layout, so every round needs a fresh one
+    benchmark.pedantic(
+        lambda layout: setup_callbacks(Mock(), layout),
+        setup=lambda: ((generated_layout(size, fan_out),), {}),
+        rounds=5
+    )
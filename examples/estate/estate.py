@@ -18,7 +18,7 @@ from dash.dependencies import Input
 
 from examples.utils.dash_convenience import options_from, plain_scatter_plot, colorized_map_plot, range_slider
 from simpledash.callbacks import setup_callbacks
-from simpledash.data.data_providers import data_provider
+from simpledash.data.data_providers import data_provider, DashInput
 
 data_file_path = root_dir = Path(__file__).parent / "flats.csv"
 flats = pandas.read_csv(data_file_path)
@@ -49,11 +49,13 @@ price_filter = range_slider('pricefilter', min_max_from=flats_by_availability['r
 
 
 # apply filtering by area and price
-@data_provider(flats_by_availability, Input(area_filter.id, 'value'), Input(price_filter.id, 'value'))
-def flats_to_display(df, area_filter_value, price_filter_value):
-    df = df[df['area'].between(area_filter_value[0], area_filter_value[1])]
-    df = df[df['rent_price'].between(price_filter_value[0], price_filter_value[1])]
-    return df
+# comparisons of data providers are lazy too - and the whole filter is computed in a single pass over the data
+area_range = DashInput(Input(area_filter.id, 'value'))
+price_range = DashInput(Input(price_filter.id, 'value'))
+flats_to_display = flats_by_availability[
+    flats_by_availability['area'].between(area_range[0], area_range[1])
+    & flats_by_availability['rent_price'].between(price_range[0], price_range[1])
+]
 
 
 # the task was to plot price against area, but we will actually give user a choice of both X and Y columns
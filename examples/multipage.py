@@ -52,7 +52,8 @@ app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
     html.Div(children=current_page_layout, id='page-content')
 ])
-setup_callbacks(app, app.layout)
+# pages never change, so they can be serialized once instead of on every navigation
+setup_callbacks(app, app.layout, cache_layouts=True)
 
 if __name__ == '__main__':
     app.run_server(debug=False)
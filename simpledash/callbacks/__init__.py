@@ -1,32 +1,121 @@
-from typing import List
+from concurrent.futures import Executor
+from typing import List, Tuple, Optional, Set
 
+import dash
 from dash import Dash
 from dash.dependencies import Output, State, Input
 from dash.development.base_component import Component
+from dash.exceptions import DashException
 
-from simpledash.inspector.accessors import NestedAccessor, PropertyAccessor, DummyAccessor
+try:
+    from dash import Patch
+except ImportError:  # dash < 2.9
+    Patch = None
+
+from simpledash.callbacks.clientside import to_javascript
+from simpledash.callbacks.downsampling import Downsampling
+from simpledash.callbacks.layouts import LayoutCache
+from simpledash.callbacks.precompute import precompute, finite_inputs
+from simpledash.callbacks.typed_arrays import to_typed_array
+from simpledash.data.cache import ResultStore
+from simpledash.data.data_providers import EvaluationContext, all_operations, evaluate_all, ProcessMethodProxy, \
+    DataProvider
+from simpledash.data.metrics import Metrics
+from simpledash.data.plan import EvaluationPlan
+from simpledash.data.process_pool import warm_up_process_pool
+from simpledash.data.single_flight import SingleFlight
+from simpledash.inspector.accessors import NestedAccessor, PropertyAccessor, DummyAccessor, set_all
 from simpledash.inspector.component import find_data_providers, DataProviderWithAccessor
+from simpledash.inspector.graph import register_callback
 from simpledash.inspector.layout import find_all_components
 
+CallbackTarget = Tuple[Component, str, List[DataProviderWithAccessor]]
+
 
-def setup_callbacks(app: Dash, layout=None):
+def setup_callbacks(app: Dash, layout=None, group_callbacks: bool = False, cache: ResultStore = None,
+                    partial_updates: bool = False, clientside: bool = False, executor: Executor = None,
+                    compile_plans: bool = True, metrics: Metrics = None, cache_layouts: bool = False,
+                    typed_arrays: bool = False, downsampling: Downsampling = None, single_flight: bool = False,
+                    precompute_initial_values: bool = False, precompute_finite_inputs: bool = False):
     """
     Scans the layout to find instances of data_provider and sets callbacks for them
 
     :param app: the app to use for callbacks
     :param layout: layout which will be scanned. If not given, app.layout is going to be used
+    :param group_callbacks: if True, properties whose data providers share some operation are going to be updated
+        by a single, multi-output callback - so the shared operation is evaluated once per user interaction
+    :param cache: if given, results of data providers are going to be kept there and reused between callbacks
+    :param partial_updates: if True, callbacks are going to send only the values of data providers (as dash.Patch),
+        instead of uploading and sending back the whole property. Requires dash>=2.9
+    :param clientside: if True, properties whose data providers only access items of inputs (by constant string
+        or integer keys) are going to be updated by clientside callbacks, so no request to the server is needed.
+        Requires dash>=1.11
+    :param executor: if given (e.g. ThreadPoolExecutor), independent data providers are going to be evaluated
+        in parallel on it. Useful when data providers release the GIL (pandas, numpy, I/O)
+    :param compile_plans: if True, data providers of each callback are compiled to a flat evaluation plan,
+        which is cheaper to run than evaluating them one by one. Not used together with cache, executor or single_flight
+    :param metrics: if given, calls of data providers are going to be measured and recorded there.
+        Use `metrics.register_route(app.server)` to expose them to Prometheus
+    :param cache_layouts: if True, components returned by data providers (e.g. pages of multi-page app) are going to be
+        serialized to JSON once and reused while the same layout object is returned. Layouts must not be modified then
+    :param typed_arrays: if True, numeric numpy arrays and pandas Series put into figures are going to be sent
+        as base64 encoded typed arrays, instead of lists of numbers. Requires plotly.js>=2.28
+    :param downsampling: if given (e.g. Downsampling(max_points=2000, strategy='bucket')), traces of figures
+        whose x / y or lat / lon come from data providers are going to be reduced to at most max_points points
+    :param single_flight: if True, concurrent requests evaluating the same data provider for the same input values
+        (e.g. many users opening the dashboard at once) are going to wait for a single computation and share its result
+    :param precompute_initial_values: if True, data providers are going to be evaluated once, for the initial values
+        of inputs given in the layout, and their results embedded in the layout - so loading the page does not fire
+        any callback. Use only if these results don't change over time. Requires dash>=1.12
+    :param precompute_finite_inputs: if True, data providers depending only on dropdowns and radio items with fixed
+        options are going to be evaluated for all combinations of their values and kept in the cache, before any
+        callback is called. Requires cache - with a SharedFileStore, results are computed once and persisted on disk
     """
+    if partial_updates and Patch is None:
+        raise ValueError("partial_updates require dash>=2.9")
+    if precompute_finite_inputs and cache is None:
+        raise ValueError("precompute_finite_inputs requires cache")
+    settings = _Settings(cache, partial_updates, executor, compile_plans, metrics, cache_layouts, typed_arrays,
+                         downsampling, single_flight)
     layout = layout or app.layout
     component_with_data_providers = _find_all_components_and_their_data_providers(layout)
+    data_providers = [p.data_provider for _, _, data_providers in component_with_data_providers for p in data_providers]
+
+    if cache is not None:
+        cache.keep_results_of(data_providers)
+    if precompute_finite_inputs:
+        precompute(data_providers, finite_inputs(layout), cache, executor)
 
     for component, component_property, data_providers in component_with_data_providers:
         _replace_data_providers_with_nones(component, component_property, data_providers)
 
-    for component, component_property, data_providers in component_with_data_providers:
-        _setup_callback(app, component, component_property, data_providers)
+    if _uses_process_data_providers(component_with_data_providers):
+        warm_up_process_pool()
+
+    precomputed = set()
+    if precompute_initial_values:
+        precomputed = _precompute_initial_values(layout, component_with_data_providers, settings)
+
+    if clientside:
+        component_with_data_providers = [
+            target for target in component_with_data_providers
+            if not _setup_clientside_callback(app, *target, prevent_initial_call=_output_of(target) in precomputed)
+        ]
 
+    if group_callbacks:
+        for group in _group_by_shared_operations(component_with_data_providers):
+            prevent_initial_call = all(_output_of(target) in precomputed for target in group)
+            if len(group) == 1:
+                _setup_callback(app, *group[0], settings=settings, prevent_initial_call=prevent_initial_call)
+            else:
+                _setup_grouped_callback(app, group, settings=settings, prevent_initial_call=prevent_initial_call)
+        return
 
-def _find_all_components_and_their_data_providers(layout):
+    for target in component_with_data_providers:
+        _setup_callback(app, *target, settings=settings, prevent_initial_call=_output_of(target) in precomputed)
+
+
+def _find_all_components_and_their_data_providers(layout) -> List[CallbackTarget]:
     component_with_data_providers = []
     for component in find_all_components(layout):
         for component_property, data_providers in find_data_providers(component).items():
@@ -48,27 +137,335 @@ def _replace_data_providers_with_nones(component: Component, component_property:
     return component
 
 
+class _Settings:
+    def __init__(self, cache: ResultStore = None, partial_updates: bool = False, executor: Executor = None,
+                 compile_plans: bool = True, metrics: Metrics = None, cache_layouts: bool = False,
+                 typed_arrays: bool = False, downsampling: Downsampling = None, single_flight: bool = False):
+        self.cache = cache
+        self.partial_updates = partial_updates
+        self.executor = executor
+        self.compile_plans = compile_plans
+        self.metrics = metrics
+        self.layout_cache = LayoutCache() if cache_layouts else None
+        self.typed_arrays = typed_arrays
+        self.downsampling = downsampling
+        self.single_flight = SingleFlight() if single_flight else None
+
+    def context(self, inputs: List[Input], values) -> EvaluationContext:
+        return EvaluationContext(dict(zip(inputs, values)), self.cache, self.executor, self.metrics, self.single_flight)
+
+
+class _Evaluator:
+    """
+    Evaluates data providers of a single callback. Unless the providers need a cache, an executor, single flight
+    or asyncio, they are compiled to evaluation plans (one per set of providers triggered together) on the first use.
+    """
+
+    def __init__(self, targets: List[CallbackTarget], settings: _Settings):
+        data_providers = [p.data_provider for _, _, data_providers in targets for p in data_providers]
+        self._use_plans = settings.compile_plans and settings.cache is None and settings.executor is None \
+            and settings.single_flight is None \
+            and not any(p._is_async for p in all_operations(data_providers))
+        self._metrics = settings.metrics
+        self._plans = {}
+
+    def evaluate(self, data_providers: List[DataProvider], context: EvaluationContext) -> List:
+        if not self._use_plans:
+            return evaluate_all(data_providers, context)
+        key = tuple(id(provider) for provider in data_providers)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = EvaluationPlan(data_providers, self._metrics)
+        return plan.run(context)
+
+
 def _setup_callback(app: Dash,
                     component: Component,
                     component_property: str,
-                    data_providers: List[DataProviderWithAccessor]):
+                    data_providers: List[DataProviderWithAccessor],
+                    settings: _Settings = None,
+                    prevent_initial_call: bool = False):
+    settings = settings or _Settings()
+    targets = [(component, component_property, data_providers)]
+    evaluator = _Evaluator(targets, settings)
     inputs = _get_all_inputs(data_providers)
     if not inputs:
         inputs = [Input(component.id, 'id')]
+    register_callback(app, targets, inputs)
 
     @app.callback(
         Output(component.id, component_property),
         inputs,
-        [State(component.id, component_property)]
+        _states(targets, settings),
+        **_callback_options(prevent_initial_call)
+    )
+    def execute(*args):
+        context = settings.context(inputs, args[:len(inputs)])
+        current_values = args[len(inputs):] or [None]
+        return _update_targets(targets, current_values, context, evaluator, settings)[0]
+
+
+def _setup_grouped_callback(app: Dash, group: List[CallbackTarget], settings: _Settings = None,
+                            prevent_initial_call: bool = False):
+    settings = settings or _Settings()
+    evaluator = _Evaluator(group, settings)
+    inputs = _get_all_inputs([p for _, _, data_providers in group for p in data_providers])
+    if not inputs:
+        inputs = [Input(group[0][0].id, 'id')]
+    register_callback(app, group, inputs)
+
+    @app.callback(
+        [Output(component.id, component_property) for component, component_property, _ in group],
+        inputs,
+        _states(group, settings),
+        **_callback_options(prevent_initial_call)
     )
     def execute(*args):
-        context = dict(zip(inputs, args[:-1]))
-        current_value = args[-1]
+        context = settings.context(inputs, args[:len(inputs)])
+        current_values = args[len(inputs):] or [None] * len(group)
+        return _update_targets(group, current_values, context, evaluator, settings)
+
+
+def _setup_clientside_callback(app: Dash,
+                               component: Component,
+                               component_property: str,
+                               data_providers: List[DataProviderWithAccessor],
+                               prevent_initial_call: bool = False) -> bool:
+    inputs = _get_all_inputs(data_providers)
+    javascript = to_javascript(data_providers, inputs)
+    if not inputs or javascript is None:
+        return False
+
+    app.clientside_callback(
+        javascript,
+        Output(component.id, component_property),
+        inputs,
+        [State(component.id, component_property)],
+        **_callback_options(prevent_initial_call)
+    )
+    register_callback(app, [(component, component_property, data_providers)], inputs, clientside=True)
+    return True
+
+
+def _callback_options(prevent_initial_call: bool) -> dict:
+    # dash<1.12 doesn't know prevent_initial_call, so it's passed only when needed
+    return dict(prevent_initial_call=True) if prevent_initial_call else {}
+
+
+def _states(targets: List[CallbackTarget], settings: _Settings) -> List[State]:
+    if settings.partial_updates:
+        return []
+    return [State(component.id, component_property) for component, component_property, _ in targets]
+
+
+def _update_targets(targets: List[CallbackTarget], current_values, context: EvaluationContext,
+                    evaluator: _Evaluator, settings: _Settings) -> List:
+    """
+    Evaluates data providers of all targets at once and puts their values into current values of the properties.
+    If triggered inputs are known, only providers depending on them are evaluated - the rest keeps the current value.
+    """
+    triggered = _triggered_inputs()
+    affected = [_affected(component_property, data_providers, triggered, settings)
+                for _, component_property, data_providers in targets]
+    new_values = iter(evaluator.evaluate([p.data_provider for providers in affected for p in providers], context))
+
+    updates = []
+    for (component, component_property, _), current_value, data_providers in zip(targets, current_values, affected):
+        values = _encode(component, component_property, data_providers, [next(new_values) for _ in data_providers],
+                         settings)
+        if not data_providers:
+            updates.append(dash.no_update)
+        elif settings.partial_updates:
+            updates.append(_patch(data_providers, values))
+        else:
+            updates.append(_apply(current_value, data_providers, values))
+    return updates
+
+
+def _affected(component_property: str, data_providers: List[DataProviderWithAccessor], triggered: Optional[Set[Input]],
+              settings: _Settings) -> List[DataProviderWithAccessor]:
+    if triggered is None:
+        return data_providers
+    positions = {i for i, p in enumerate(data_providers) if p.data_provider.depends_on() & triggered}
+    if settings.downsampling is not None and component_property == 'figure':
+        # values of a trace kept in the browser were reduced to points chosen for all of them together
+        positions = settings.downsampling.whole_traces([p.accessor.path() for p in data_providers], positions)
+    return [p for i, p in enumerate(data_providers) if i in positions]
+
+
+def _encode(component: Component, component_property: str, data_providers: List[DataProviderWithAccessor],
+            values: List, settings: _Settings) -> List:
+    """
+    Prepares values of data providers to be sent to the browser
+    """
+    if settings.downsampling is not None and component_property == 'figure':
+        values = settings.downsampling.apply([p.accessor.path() for p in data_providers], values,
+                                             getattr(component, component_property, None))
+    if settings.typed_arrays and component_property == 'figure':
+        values = [to_typed_array(value) for value in values]
+    if settings.layout_cache is not None:
+        values = [settings.layout_cache.serialized(value) for value in values]
+    return values
+
+
+def _precompute_initial_values(layout, component_with_data_providers: List[CallbackTarget],
+                               settings: _Settings) -> Set[Tuple[str, str]]:
+    """
+    Evaluates data providers for the initial values of inputs found in the layout and puts the results into the layout.
+    Targets depending on outputs of other targets are evaluated after them. Targets depending on properties not set
+    explicitly in the layout, on values unknown before the page is loaded (like the url) or failing to evaluate
+    are skipped.
+    Returns outputs (component id and property) of the targets put into the layout.
+    """
+    outputs = {_output_of(target) for target in component_with_data_providers}
+    values = {inp: value for inp, value in _initial_input_values(layout).items()
+              if (inp.component_id, inp.component_property) not in outputs}
+    context = settings.context(list(values), list(values.values()))
+
+    precomputed = set()
+    pending = list(component_with_data_providers)
+    while pending:
+        ready = [target for target in pending
+                 if not any((inp.component_id, inp.component_property) in outputs - precomputed
+                            for inp in _inputs_of(target))]
+        if not ready:
+            break  # the rest depends on targets which cannot be precomputed
+        for target in ready:
+            pending.remove(target)
+            component, component_property, data_providers = target
+            if not all(inp in context for inp in _inputs_of(target)):
+                continue
+            try:
+                new_values = evaluate_all([p.data_provider for p in data_providers], context)
+            except Exception:
+                continue  # the callback is going to be fired on page load and report the error then
+            new_values = _encode(component, component_property, data_providers, new_values, settings)
+            value = _apply(getattr(component, component_property, None), data_providers, new_values)
+            setattr(component, component_property, value)
+            context[Input(component.id, component_property)] = value
+            precomputed.add(_output_of(target))
+    return precomputed
+
+
+# components whose properties are set by the browser, so they are not known before the page is loaded
+_BROWSER_COMPONENTS = {'Location', 'Store'}
+
+
+def _initial_input_values(layout) -> dict:
+    values = {}
+    for component in find_all_components(layout):
+        component_id = getattr(component, 'id', None)
+        if not isinstance(component_id, str) or getattr(component, '_type', None) in _BROWSER_COMPONENTS:
+            continue
+        for component_property in component.available_properties:
+            # properties missing in the layout get defaults of the renderer (like n_clicks=0), unknown here
+            if hasattr(component, component_property):
+                values[Input(component_id, component_property)] = getattr(component, component_property)
+    return values
+
+
+def _output_of(target: CallbackTarget) -> Tuple[str, str]:
+    component, component_property, _ = target
+    return component.id, component_property
+
+
+def _inputs_of(target: CallbackTarget) -> Set[Input]:
+    return {inp for p in target[2] for inp in p.data_provider.depends_on()}
+
+
+def _apply(current_value, data_providers: List[DataProviderWithAccessor], values: List):
+    return set_all(current_value, [data_provider.accessor for data_provider in data_providers], values)
+
+
+def _patch(data_providers: List[DataProviderWithAccessor], values: List):
+    """
+    Returns a Patch with the new values, as the current value of the property is not known with partial updates
+    """
+    patch = Patch()
+    for data_provider, value in zip(data_providers, values):
+        path = data_provider.accessor.path()
+        if not path:
+            return value  # data provider replaces the whole property
+        target = patch
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+    return patch
+
+
+def _triggered_inputs() -> Optional[Set[Input]]:
+    """
+    Returns inputs that have triggered the current callback or None, if they are unknown
+    (e.g. this is the initial call or the callback is executed outside of dash)
+    """
+    try:
+        triggered = dash.callback_context.triggered
+    except (DashException, RuntimeError):
+        return None
+
+    inputs = set()
+    for trigger in triggered or []:
+        component_id, _, component_property = trigger['prop_id'].rpartition('.')
+        if not component_id:
+            return None
+        inputs.add(Input(component_id, component_property))
+    return inputs or None
+
+
+def _group_by_shared_operations(component_with_data_providers: List[CallbackTarget]) -> List[List[CallbackTarget]]:
+    """
+    Groups targets (component properties), so that the ones sharing an operation end up in the same group.
+    Targets are not merged if an output of the merged group is (directly, or through other callbacks) its input,
+    as dash does not allow circular callbacks.
+    """
+    groups = []
+    pending = [_CallbackGroup([target]) for target in component_with_data_providers]
+    while pending:
+        merged = pending.pop(0)
+        for group in list(groups):
+            if not merged.shares_operations_with(group):
+                continue
+            candidate = merged.merge(group)
+            if not candidate.is_circular([other for other in groups if other is not group] + pending):
+                groups.remove(group)
+                merged = candidate
+        groups.append(merged)
+    return [group.targets for group in groups]
+
+
+class _CallbackGroup:
+    def __init__(self, targets: List[CallbackTarget]):
+        self.targets = targets
+        data_providers = [p.data_provider for _, _, data_providers in targets for p in data_providers]
+        self.operations = {id(operation) for operation in all_operations(data_providers)}
+        self.outputs = {(component.id, component_property) for component, component_property, _ in targets}
+        self.inputs = {(inp.component_id, inp.component_property)
+                       for data_provider in data_providers for inp in data_provider.depends_on()}
+
+    def shares_operations_with(self, other: '_CallbackGroup') -> bool:
+        return bool(self.operations & other.operations)
+
+    def is_circular(self, others: List['_CallbackGroup']) -> bool:
+        """
+        Returns True if outputs of the group are its inputs, possibly after going through the other callbacks
+        """
+        reached = set(self.outputs)
+        changed = True
+        while changed:
+            changed = False
+            for other in others:
+                if other.inputs & reached and not other.outputs <= reached:
+                    reached |= other.outputs
+                    changed = True
+        return bool(reached & self.inputs)
+
+    def merge(self, other: '_CallbackGroup') -> '_CallbackGroup':
+        return _CallbackGroup(other.targets + self.targets)
+
 
-        for data_provider in data_providers:
-            new_value = data_provider.data_provider.evaluate(context)
-            current_value = data_provider.accessor.set(current_value, new_value)
-        return current_value
+def _uses_process_data_providers(component_with_data_providers: List[CallbackTarget]) -> bool:
+    data_providers = [p.data_provider for _, _, data_providers in component_with_data_providers for p in data_providers]
+    return any(isinstance(operation, ProcessMethodProxy) for operation in all_operations(data_providers))
 
 
 def _get_all_inputs(data_providers):
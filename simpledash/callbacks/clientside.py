@@ -0,0 +1,80 @@
+import json
+import operator
+from typing import List, Optional
+
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import DataProvider, DashInput, StaticValueProvider, Operation, MethodProxy
+from simpledash.inspector.component import DataProviderWithAccessor
+
+_JAVASCRIPT_TEMPLATE = """function ({arguments}) {{
+    var item = function (obj, key) {{
+        if (Array.isArray(obj) && typeof key === 'number' && key < 0) {{
+            return obj[obj.length + key];
+        }}
+        return obj[key];
+    }};
+    var assign = function (obj, path, value) {{
+        if (path.length === 0) {{
+            return value;
+        }}
+        var copy = Array.isArray(obj) ? obj.slice() : Object.assign({{}}, obj);
+        copy[path[0]] = assign(copy[path[0]], path.slice(1), value);
+        return copy;
+    }};
+    var result = current;
+{assignments}
+    return result;
+}}"""
+
+
+def to_javascript(data_providers: List[DataProviderWithAccessor], inputs: List[Input]) -> Optional[str]:
+    """
+    Translates data providers into body of a clientside callback, which takes values of inputs
+    and current value of the property as arguments.
+    Returns None if any of the data providers does something else than accessing inputs' items by constant
+    string or integer keys.
+    """
+    arguments = ['input_{}'.format(i) for i in range(len(inputs))]
+    input_arguments = dict(zip(inputs, arguments))
+
+    assignments = []
+    for data_provider in data_providers:
+        expression = _expression(data_provider.data_provider, input_arguments)
+        if expression is None:
+            return None
+        assignments.append("    result = assign(result, {}, {});".format(
+            json.dumps(data_provider.accessor.path()), expression
+        ))
+
+    return _JAVASCRIPT_TEMPLATE.format(
+        arguments=", ".join(arguments + ['current']),
+        assignments="\n".join(assignments)
+    )
+
+
+def _expression(provider: DataProvider, input_arguments) -> Optional[str]:
+    if isinstance(provider, DashInput):
+        return input_arguments[provider._dash_input]
+
+    if isinstance(provider, StaticValueProvider):
+        try:
+            return json.dumps(provider.value)
+        except (TypeError, ValueError):
+            return None
+
+    if isinstance(provider, Operation) and not isinstance(provider, MethodProxy) \
+            and provider._op is operator.getitem and len(provider._args) == 2 and not provider._kwargs \
+            and _is_item_key(provider._args[1]):
+        # attributes and other keys (like floats or tuples) behave differently in javascript, so they are left
+        # to the server
+        obj = _expression(provider._args[0], input_arguments)
+        if obj is None:
+            return None
+        return "item({}, {})".format(obj, json.dumps(provider._args[1].value))
+
+    return None
+
+
+def _is_item_key(provider: DataProvider) -> bool:
+    return isinstance(provider, StaticValueProvider) and type(provider.value) in (str, int)
@@ -0,0 +1,190 @@
+"""
+Reduces number of points of figure traces fed by data providers, so graphs with hundreds of thousands of rows
+send (and render) only as many points as can actually be seen.
+"""
+from collections import OrderedDict
+from typing import List, Tuple, Set
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+_COORDINATES = (('x', 'y'), ('lon', 'lat'))
+
+
+class Downsampling:
+    """
+    Keeps at most `max_points` points of every trace whose coordinates (x / y or lat / lon) come from data providers.
+    All the other per-point values of the trace given by data providers (customdata, text, marker.color...)
+    are reduced to the same points, so they stay aligned. Traces with per-point values given directly in the layout
+    are not reduced, as these values are not sent by callbacks.
+
+    Strategies:
+    - 'lttb' (Largest-Triangle-Three-Buckets) - keeps the visual shape of lines; points should be ordered by x
+    - 'bucket' - splits the plane into a grid of at most `max_points` cells and keeps one point of every occupied cell;
+      suits scatter plots and maps, as it keeps outliers and the extent of the data
+    """
+
+    STRATEGIES = ('lttb', 'bucket')
+
+    def __init__(self, max_points: int = 5000, strategy: str = 'lttb'):
+        if numpy is None:
+            raise ImportError("Downsampling requires numpy")
+        if strategy not in self.STRATEGIES:
+            raise ValueError("Unknown downsampling strategy {}, use one of {}".format(strategy, self.STRATEGIES))
+        if max_points < 3:
+            raise ValueError("max_points must be at least 3")
+        self.max_points = max_points
+        self.strategy = strategy
+
+    def apply(self, paths: List[List], values: List, figure=None) -> List:
+        """
+        Returns values (placed under given paths of the figure) with traces reduced to at most max_points points.
+        `figure` is the figure of the layout, with values given directly in it
+        """
+        values = list(values)
+        for trace, positions in _traces(paths).items():
+            attributes = {tuple(paths[i][2:]): i for i in positions}
+            for x_name, y_name in _COORDINATES:
+                coordinates = [attributes.get((name,)) for name in (x_name, y_name)]
+                if coordinates != [None, None]:
+                    self._reduce_trace(values, positions, coordinates, _static_values(figure, trace, attributes))
+                    break
+        return values
+
+    def whole_traces(self, paths: List[List], positions: Set[int]) -> Set[int]:
+        """
+        Returns given positions together with positions of all the other values of their traces - as a trace can be
+        reduced only as a whole, so its values stay aligned
+        """
+        positions = set(positions)
+        for trace in _traces(paths).values():
+            if positions.intersection(trace):
+                positions.update(trace)
+        return positions
+
+    def indices(self, x, y) -> 'numpy.ndarray':
+        """
+        Returns (sorted) indices of points to keep
+        """
+        x, y = _numeric(x), _numeric(y)
+        if len(x) <= self.max_points:
+            return numpy.arange(len(x))
+        if self.strategy == 'lttb':
+            return lttb_indices(x, y, self.max_points)
+        return bucket_indices(x, y, self.max_points)
+
+    def _reduce_trace(self, values: List, positions: List[int], coordinates: List, static_values: List):
+        length = _length(values[next(i for i in coordinates if i is not None)])
+        if length is None or length <= self.max_points:
+            return
+        if any(_length(value) == length for value in static_values):
+            return  # points would not line up with values which are not reduced
+        x, y = [numpy.arange(length) if i is None else values[i] for i in coordinates]
+        if _length(x) != length or _length(y) != length:
+            return
+        indices = self.indices(x, y)
+        for i in positions:
+            if _length(values[i]) == length:
+                values[i] = _take(values[i], indices)
+
+
+def lttb_indices(x: 'numpy.ndarray', y: 'numpy.ndarray', max_points: int) -> 'numpy.ndarray':
+    """
+    Largest-Triangle-Three-Buckets: keeps the first and the last point and from each of (max_points - 2) buckets
+    in between the point forming the largest triangle with the point kept from the previous bucket
+    and the average of the next bucket
+    """
+    n = len(x)
+    edges = numpy.linspace(1, n - 1, max_points - 1).astype(int)
+    indices = numpy.empty(max_points, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x, next_y = numpy.nanmean(x[end:next_end]), numpy.nanmean(y[end:next_end])
+        areas = numpy.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                          - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + (int(numpy.nanargmax(areas)) if not numpy.isnan(areas).all() else 0)
+        indices[bucket + 1] = previous
+    return indices
+
+
+def bucket_indices(x: 'numpy.ndarray', y: 'numpy.ndarray', max_points: int) -> 'numpy.ndarray':
+    """
+    Keeps the first point of every occupied cell of a (at most max_points cells) grid spanning the data.
+    Points with missing coordinates are dropped, as they are not displayed anyway
+    """
+    valid = numpy.flatnonzero(numpy.isfinite(x) & numpy.isfinite(y))
+    side = int(numpy.sqrt(max_points))
+    if len(valid) == 0:
+        return valid
+    cells = _cell(x[valid], side) * side + _cell(y[valid], side)
+    _, first = numpy.unique(cells, return_index=True)
+    return valid[numpy.sort(first)]
+
+
+def _cell(values: 'numpy.ndarray', side: int) -> 'numpy.ndarray':
+    low, high = values.min(), values.max()
+    if high == low:
+        return numpy.zeros(len(values), dtype=int)
+    return numpy.minimum(((values - low) / (high - low) * side).astype(int), side - 1)
+
+
+def _traces(paths: List[List]) -> 'OrderedDict[Tuple, List[int]]':
+    traces = OrderedDict()
+    for i, path in enumerate(paths):
+        if len(path) >= 3 and path[0] == 'data':
+            traces.setdefault(tuple(path[:2]), []).append(i)
+    return traces
+
+
+def _static_values(figure, trace: Tuple, attributes) -> List:
+    """
+    Returns values of the trace given directly in the figure (not by data providers), including nested ones
+    """
+    try:
+        static_trace = figure[trace[0]][trace[1]]
+    except (TypeError, KeyError, IndexError):
+        return []
+    values = []
+    stack = [((), static_trace)]
+    while stack:
+        path, value = stack.pop()
+        if path in attributes:
+            continue
+        if isinstance(value, dict):
+            stack.extend((path + (name,), v) for name, v in value.items())
+        elif path:
+            values.append(value)
+    return values
+
+
+def _numeric(values) -> 'numpy.ndarray':
+    array = numpy.asarray(values)
+    if array.dtype.kind == 'M':
+        return array.astype('datetime64[ns]').astype('int64').astype(float)
+    if array.dtype.kind not in 'iufb':
+        return numpy.arange(len(array), dtype=float)  # non-numeric values (e.g. categories) are replaced by positions
+    return array.astype(float)
+
+
+def _length(value):
+    if isinstance(value, (str, bytes, dict)) or not hasattr(value, '__len__'):
+        return None
+    return len(value)
+
+
+def _take(value, indices: 'numpy.ndarray'):
+    if pandas is not None and isinstance(value, pandas.Series):
+        return value.iloc[indices]
+    if isinstance(value, numpy.ndarray) or (pandas is not None and isinstance(value, pandas.Index)):
+        return value[indices]
+    return [value[i] for i in indices]
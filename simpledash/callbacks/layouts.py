@@ -0,0 +1,58 @@
+import json
+import threading
+from collections import OrderedDict
+
+from dash.development.base_component import Component
+from plotly.utils import PlotlyJSONEncoder
+
+
+class SerializedLayout:
+    """
+    Component tree converted once to its JSON form. Dash encodes it directly, without walking the tree
+    and calling `to_plotly_json` of every component again.
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self._json = json.loads(json.dumps(layout, cls=PlotlyJSONEncoder))
+
+    def to_plotly_json(self):
+        return self._json
+
+
+class LayoutCache:
+    """
+    Keeps serialized forms of layouts returned by data providers, keyed on the layout object -
+    so returning the same (unmodified) layout again costs no serialization.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # id of layout -> SerializedLayout, which also keeps the layout alive
+        self._lock = threading.Lock()
+
+    def serialized(self, value):
+        """
+        Returns serialized form of the value, if it is a component (or list of components), or the value itself
+        """
+        if not _is_layout(value):
+            return value
+        key = id(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.layout is value:
+                self._entries.move_to_end(key)
+                return entry
+        entry = SerializedLayout(value)
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+
+def _is_layout(value) -> bool:
+    if isinstance(value, Component):
+        return True
+    return isinstance(value, list) and bool(value) and all(isinstance(v, (Component, str)) for v in value) \
+        and any(isinstance(v, Component) for v in value)
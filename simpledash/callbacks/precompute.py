@@ -0,0 +1,104 @@
+"""
+Evaluates data providers depending only on inputs with a finite set of values (dropdowns and radio items
+with fixed options) for all combinations of these values, and keeps the results in a store - so callbacks
+using the same store as cache find them there instead of computing.
+"""
+import itertools
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+
+from dash.dependencies import Input
+
+from simpledash.data.cache import ResultStore
+from simpledash.data.data_providers import DataProvider, EvaluationContext, evaluate_all, Operation
+from simpledash.inspector.layout import find_all_components
+
+_FINITE_COMPONENTS = {'Dropdown', 'RadioItems'}
+
+
+def finite_inputs(layout) -> Dict[Input, list]:
+    """
+    Returns all the values each dropdown (single choice) and radio items of the layout can take
+    """
+    domains = {}
+    for component in find_all_components(layout):
+        if getattr(component, '_type', None) not in _FINITE_COMPONENTS or getattr(component, 'multi', False):
+            continue
+        values = _option_values(getattr(component, 'options', None))
+        if values is None or not isinstance(getattr(component, 'id', None), str):
+            continue
+        if component._type == 'Dropdown' and getattr(component, 'clearable', True):
+            values.append(None)
+        domains[Input(component.id, 'value')] = values
+    return domains
+
+
+def precompute(data_providers: List[DataProvider], domains: Dict[Input, list], store: ResultStore,
+               executor: Executor = None, max_combinations: int = 10000) -> int:
+    """
+    Evaluates the largest parts of the data providers which depend only on inputs of given domains,
+    for every combination of their values (unless there are more than max_combinations of them), and puts
+    the results (with the intermediate ones) into the store. Combinations failing to evaluate are skipped.
+    Results are found later only for providers with keys stable between processes - i.e. built of functions
+    defined at the top level of modules and of primitive static values.
+
+    :return: number of evaluated combinations
+    """
+    parts = _finite_parts(data_providers, domains)
+    store.keep_results_of(parts)
+    groups = {}
+    for provider in parts:
+        inputs = tuple(sorted(provider.depends_on(), key=lambda inp: (inp.component_id, inp.component_property)))
+        groups.setdefault(inputs, []).append(provider)
+
+    tasks = []
+    for inputs, providers in groups.items():
+        combinations = _product_size(domains[inp] for inp in inputs)
+        if combinations > max_combinations:
+            continue
+        for values in itertools.product(*(domains[inp] for inp in inputs)):
+            tasks.append((providers, dict(zip(inputs, values))))
+
+    def evaluate(task) -> bool:
+        providers, inputs = task
+        try:
+            evaluate_all(providers, EvaluationContext(inputs, store))
+            return True
+        except Exception:
+            return False
+
+    results = executor.map(evaluate, tasks) if executor is not None else map(evaluate, tasks)
+    return sum(results)
+
+
+def _finite_parts(data_providers: List[DataProvider], domains: Dict[Input, list]) -> List[DataProvider]:
+    parts = []
+    visited = set()
+    to_visit = list(data_providers)
+    while to_visit:
+        provider = to_visit.pop()
+        if id(provider) in visited:
+            continue
+        visited.add(id(provider))
+        inputs = provider.depends_on()
+        if inputs and all(inp in domains for inp in inputs):
+            if isinstance(provider, Operation):  # values of inputs themselves are known anyway
+                parts.append(provider)
+        else:
+            to_visit.extend(provider.arguments())
+    return parts
+
+
+def _option_values(options) -> Optional[list]:
+    if isinstance(options, dict):
+        return list(options)
+    if not isinstance(options, (list, tuple)):
+        return None
+    return [option['value'] if isinstance(option, dict) else option for option in options]
+
+
+def _product_size(domains) -> int:
+    size = 1
+    for domain in domains:
+        size *= len(domain)
+    return size
@@ -0,0 +1,65 @@
+"""
+Encodes numeric arrays as plotly.js typed arrays ({"dtype": "f8", "bdata": "<base64>"}), which are much smaller
+and cheaper to produce than JSON lists of numbers. Understood by plotly.js>=2.28, only inside figures.
+"""
+import base64
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+_TYPED_ARRAY_DTYPES = {'i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8'}
+
+
+def to_typed_array(value):
+    """
+    Returns numeric numpy array, pandas Series or Index as typed array spec, or the value itself if it can't be encoded
+    """
+    if numpy is None:
+        return value
+    if pandas is not None and isinstance(value, (pandas.Series, pandas.Index)):
+        if not isinstance(value.dtype, numpy.dtype):
+            return value  # extension arrays (nullable integers, categories...) may hold missing values
+        value = value.to_numpy()
+    if not isinstance(value, numpy.ndarray) or value.size == 0 or value.ndim > 2:
+        return value
+
+    array = _with_supported_dtype(value)
+    if array is None:
+        return value
+    spec = dict(dtype=array.dtype.str[1:], bdata=base64.b64encode(array.tobytes()).decode('ascii'))
+    if array.ndim > 1:
+        spec['shape'] = "{},{}".format(*array.shape)
+    return spec
+
+
+def _with_supported_dtype(array):
+    kind = array.dtype.kind
+    if kind not in 'iuf':
+        return None
+    if kind in 'iu' and array.dtype.itemsize == 8:
+        array = _narrowed(array)
+    elif kind == 'f' and array.dtype.itemsize not in (4, 8):
+        array = array.astype('f8')
+    dtype = array.dtype.newbyteorder('<')
+    if dtype.str[1:] not in _TYPED_ARRAY_DTYPES:
+        return None
+    return numpy.ascontiguousarray(array, dtype=dtype)
+
+
+def _narrowed(array):
+    """
+    plotly.js has no 64-bit integer arrays, so the smallest integer type holding all the values is used instead
+    """
+    low, high = array.min(), array.max()
+    for dtype in ('i1', 'i2', 'i4') if array.dtype.kind == 'i' else ('u1', 'u2', 'u4'):
+        info = numpy.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array.astype('f8')  # javascript numbers are doubles anyway
@@ -0,0 +1,143 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from dash.dependencies import Input
+
+MISSING = object()
+
+
+class ResultStore:
+    """
+    Place where results of data providers are kept between callback invocations
+    """
+
+    def get(self, key: Hashable):
+        """
+        Returns value stored under given key or MISSING
+        """
+        raise NotImplementedError
+
+    def put(self, key: Hashable, value):
+        raise NotImplementedError
+
+    def stores(self, provider) -> bool:
+        """
+        Returns whether results of the provider are kept in the store
+        """
+        return True
+
+    def keep_results_of(self, data_providers):
+        """
+        Called with data providers whose results are worth keeping (like the ones put into the layout)
+        """
+
+
+class ResultCache(ResultStore):
+    """
+    Keeps results of data providers between callback invocations, keyed on the provider and values of the inputs
+    it depends on. Least recently used entries are evicted once there are more than `max_entries` of them or their
+    total size exceeds `max_bytes`. Entries older than `ttl` seconds are never returned.
+
+    Cached results are shared between requests, so they must not be modified by the code using them.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, size, timestamp)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, size, timestamp = entry
+            if self.ttl is not None and self._clock() - timestamp > self.ttl:
+                self._remove(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value):
+        size = size_of(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, self._clock())
+            self._total_bytes += size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _evict(self):
+        while self._entries and (self._too_many_entries() or self._too_many_bytes()):
+            self._remove(next(iter(self._entries)))
+
+    def _too_many_entries(self):
+        return self.max_entries is not None and len(self._entries) > self.max_entries
+
+    def _too_many_bytes(self):
+        return self.max_bytes is not None and self._total_bytes > self.max_bytes
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+
+def cache_key(provider, context: Dict[Input, Any]) -> Optional[Tuple]:
+    """
+    Returns key identifying result of the provider for given input values or None, if values cannot be hashed
+    """
+    inputs = sorted(provider.depends_on(), key=lambda inp: (inp.component_id, inp.component_property))
+    try:
+        key = (provider.key(),) + tuple(freeze(context[inp]) for inp in inputs)
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+def freeze(value):
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        # True, 1 and 1.0 are equal as keys of dicts, but data providers may return different results for them
+        return type(value).__name__, value
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return 'dict', tuple(sorted((freeze(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return 'set', frozenset(freeze(v) for v in value)
+    return value
+
+
+def size_of(value, deep: bool = True) -> int:
+    """
+    Returns (approximate) size of the value in bytes. Unless `deep` is True, contents of pandas' object columns
+    (like strings) are not taken into account - which is much faster.
+    """
+    if hasattr(value, 'memory_usage'):  # pandas objects
+        usage = value.memory_usage(deep=deep)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if hasattr(value, 'nbytes'):  # numpy arrays
+        return int(value.nbytes)
+    return sys.getsizeof(value)
@@ -1,28 +1,195 @@
+import asyncio
+import hashlib
+import inspect
 import operator
-from typing import Set, Dict, Any, Union
+import threading
+import weakref
+from collections import defaultdict
+from concurrent.futures import Executor, wait, FIRST_COMPLETED
+from typing import Set, Dict, Any, Union, Callable, List, Awaitable
 
 from dash.dependencies import Input
 
+from simpledash.data.cache import ResultStore, cache_key, MISSING
+from simpledash.data.metrics import Metrics
+from simpledash.data.process_pool import run_in_process
+from simpledash.data.single_flight import SingleFlight
+
 
 class DataProviderOperationException(Exception):
     pass
 
 
+class EvaluationContext(dict):
+    """
+    Values of dash inputs for a single evaluation pass, together with results of providers already evaluated
+    during that pass - so every provider is computed at most once, no matter how many others reference it
+    """
+
+    def __init__(self, inputs: Dict[Input, Any] = None, cache: ResultStore = None, executor: Executor = None,
+                 metrics: Metrics = None, single_flight: SingleFlight = None):
+        super().__init__(inputs or {})
+        self._results = {}
+        self._pending = {}
+        self._cache = cache
+        self._single_flight = single_flight
+        self.executor = executor
+        self.metrics = metrics
+
+    def has_result_of(self, provider: 'DataProvider') -> bool:
+        return id(provider) in self._results
+
+    def result_of(self, provider: 'DataProvider', compute: Callable[[], Any]):
+        key = id(provider)
+        if key not in self._results:
+            self._results[key] = self._coalesced(provider, lambda: self._compute_or_get_cached(provider, compute))
+        return self._results[key]
+
+    def _coalesced(self, provider: 'DataProvider', compute: Callable[[], Any]):
+        """
+        Shares the computation with other threads evaluating the same provider for the same input values
+        """
+        key = cache_key(provider, self) if self._single_flight is not None else None
+        if key is None:
+            return compute()
+        return self._single_flight.do(key, compute)
+
+    def _compute_or_get_cached(self, provider: 'DataProvider', compute: Callable[[], Any]):
+        key = cache_key(provider, self) if self._cache is not None and self._cache.stores(provider) else None
+        if key is None:
+            return compute()
+        result = self._cache.get(key)
+        if result is MISSING:
+            self._record_cache_access(provider, hit=False)
+            result = compute()
+            self._cache.put(key, result)
+        else:
+            self._record_cache_access(provider, hit=True)
+        return result
+
+    def _record_cache_access(self, provider: 'DataProvider', hit: bool):
+        if self.metrics is None:
+            return
+        if hit:
+            self.metrics.record_cache_hit(provider)
+        else:
+            self.metrics.record_cache_miss(provider)
+
+    async def result_of_async(self, provider: 'DataProvider', compute: Callable[[], Awaitable]):
+        key = id(provider)
+        if key in self._results:
+            return self._results[key]
+        if key not in self._pending:
+            # concurrent branches referencing the same provider wait for a single computation
+            self._pending[key] = asyncio.ensure_future(self._compute_or_get_cached_async(provider, compute))
+        result = await self._pending[key]
+        self._results[key] = result
+        return result
+
+    async def _compute_or_get_cached_async(self, provider: 'DataProvider', compute: Callable[[], Awaitable]):
+        key = cache_key(provider, self) if self._cache is not None and self._cache.stores(provider) else None
+        if key is None:
+            return await compute()
+        result = self._cache.get(key)
+        if result is MISSING:
+            self._record_cache_access(provider, hit=False)
+            result = await compute()
+            self._cache.put(key, result)
+        else:
+            self._record_cache_access(provider, hit=True)
+        return result
+
+    @classmethod
+    def of(cls, context: Dict[Input, Any]) -> 'EvaluationContext':
+        if isinstance(context, EvaluationContext):
+            return context
+        return EvaluationContext(context)
+
+
 class DataProvider:
+    _is_async = False
+
     def depends_on(self) -> Set[Input]:
         raise NotImplementedError
 
     def evaluate(self, context: Dict[Input, Any]):
         raise NotImplementedError
 
+    async def evaluate_async(self, context: Dict[Input, Any]):
+        return self.evaluate(context)
+
+    def arguments(self) -> List['DataProvider']:
+        return []
+
+    def key(self) -> str:
+        """
+        Returns identifier of the computation done by this provider. Providers with equal keys yield equal results
+        for the same inputs. Keys are stable between processes, as long as the providers are built the same way.
+        """
+        return _digest('provider', id(self))
+
     def __getattr__(self, x) -> 'DataProvider':
         return Operation(getattr, self, x)
 
     def __getitem__(self, item) -> 'DataProvider':
-        return Operation(operator.getitem, self, item)
+        from simpledash.data.predicates import fused_selection
+
+        selection = fused_selection(self, item)
+        return selection if selection is not None else Operation(operator.getitem, self, item)
 
     def __call__(self, *args, **kwargs) -> 'DataProvider':
-        return Operation(lambda obj, *a, **kw: obj(*a, **kw), self, *args, **kwargs)
+        return Operation(_call, self, *args, **kwargs)
+
+    def __lt__(self, other) -> 'DataProvider':
+        return Operation(operator.lt, self, other)
+
+    def __le__(self, other) -> 'DataProvider':
+        return Operation(operator.le, self, other)
+
+    def __gt__(self, other) -> 'DataProvider':
+        return Operation(operator.gt, self, other)
+
+    def __ge__(self, other) -> 'DataProvider':
+        return Operation(operator.ge, self, other)
+
+    def __and__(self, other) -> 'DataProvider':
+        return Operation(operator.and_, self, other)
+
+    def __rand__(self, other) -> 'DataProvider':
+        return Operation(operator.and_, other, self)
+
+    def __or__(self, other) -> 'DataProvider':
+        return Operation(operator.or_, self, other)
+
+    def __ror__(self, other) -> 'DataProvider':
+        return Operation(operator.or_, other, self)
+
+    def __invert__(self) -> 'DataProvider':
+        return Operation(operator.invert, self)
+
+    def __add__(self, other) -> 'DataProvider':
+        return Operation(operator.add, self, other)
+
+    def __radd__(self, other) -> 'DataProvider':
+        return Operation(operator.add, other, self)
+
+    def __sub__(self, other) -> 'DataProvider':
+        return Operation(operator.sub, self, other)
+
+    def __rsub__(self, other) -> 'DataProvider':
+        return Operation(operator.sub, other, self)
+
+    def __mul__(self, other) -> 'DataProvider':
+        return Operation(operator.mul, self, other)
+
+    def __rmul__(self, other) -> 'DataProvider':
+        return Operation(operator.mul, other, self)
+
+    def __truediv__(self, other) -> 'DataProvider':
+        return Operation(operator.truediv, self, other)
+
+    def __rtruediv__(self, other) -> 'DataProvider':
+        return Operation(operator.truediv, other, self)
 
     def __bool__(self):
         raise DataProviderOperationException("Truth value of data provider is undefined")
@@ -55,25 +222,171 @@ class StaticValueProvider(DataProvider):
     def evaluate(self, context: Dict[Input, Any]):
         return self.value
 
-
-class Operation(DataProvider):
+    def key(self) -> str:
+        # subclasses (like IndexedFrame) of the same value are not interchangeable
+        return _digest('static', type(self).__module__, type(self).__qualname__, _value_key(self.value))
+
+
+class _Interned(type):
+    """
+    Makes construction of an operation return the existing node, if there is one of the same class, with the same
+    function and (structurally) the same arguments - so identical subexpressions built in different places,
+    like flats_to_display['latitude'] in two modules, are a single node, evaluated once per context
+    """
+    _nodes = weakref.WeakValueDictionary()
+    _lock = threading.RLock()
+
+    def __call__(cls, op, *args, **kwargs):
+        args = tuple(DataProvider.to_provider(v) for v in args)
+        kwargs = {k: DataProvider.to_provider(arg) for k, arg in kwargs.items()}
+        key = (cls, _op_token(op), tuple(_node_token(arg) for arg in args),
+               tuple(sorted((k, _node_token(arg)) for k, arg in kwargs.items())))
+        with cls._lock:
+            node = cls._nodes.get(key)
+            if node is None:
+                node = cls._nodes[key] = super().__call__(op, *args, **kwargs)
+            return node
+
+
+class Operation(DataProvider, metaclass=_Interned):
     def __init__(self, op, *args, **kwargs):
         self._op = op
         self._args = tuple(DataProvider.to_provider(v) for v in args)
         self._kwargs = {k: DataProvider.to_provider(arg) for k, arg in kwargs.items()}
 
         self._depends_on = set()
-        for arg in list(self._args) + list(self._kwargs.values()):
+        for arg in self.arguments():
             self._depends_on |= arg.depends_on()
+        self._is_async = asyncio.iscoroutinefunction(op) or any(arg._is_async for arg in self.arguments())
+
+        self._key = _digest(
+            'operation', _function_key(op),
+            *[arg.key() for arg in self._args],
+            *['{}={}'.format(k, arg.key()) for k, arg in sorted(self._kwargs.items())]
+        )
 
     def depends_on(self) -> Set[Input]:
         return self._depends_on
 
+    def arguments(self) -> List[DataProvider]:
+        return list(self._args) + list(self._kwargs.values())
+
+    def key(self) -> str:
+        return self._key
+
     def evaluate(self, context: Dict[Input, Any]):
+        if self._is_async:
+            return _run(self.evaluate_async(context))
+        context = EvaluationContext.of(context)
+        return context.result_of(self, lambda: self._compute(context))
+
+    def _compute(self, context: EvaluationContext):
         args = tuple(arg.evaluate(context) for arg in self._args)
         kwargs = {k: arg.evaluate(context) for k, arg in self._kwargs.items()}
+        if context.metrics is not None:
+            return context.metrics.measure(self, self._call_op, (args, kwargs), {})
+        return self._call_op(args, kwargs)
+
+    def _call_op(self, args: tuple, kwargs: dict):
         return self._op(*args, **kwargs)
 
+    async def evaluate_async(self, context: Dict[Input, Any]):
+        context = EvaluationContext.of(context)
+        return await context.result_of_async(self, lambda: self._compute_async(context))
+
+    async def _compute_async(self, context: EvaluationContext):
+        values = await asyncio.gather(*(arg.evaluate_async(context) for arg in self.arguments()))
+        args = values[:len(self._args)]
+        kwargs = dict(zip(self._kwargs.keys(), values[len(self._args):]))
+        if context.metrics is not None:
+            result = context.metrics.measure(self, self._call_op, (tuple(args), kwargs), {})
+        else:
+            result = self._call_op(tuple(args), kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def evaluate_all(data_providers: List[DataProvider], context: EvaluationContext) -> List:
+    """
+    Evaluates data providers within the same context. If any of them is asynchronous, all of them
+    are evaluated concurrently. Otherwise, if the context has an executor, independent operations
+    are evaluated in parallel by the executor.
+    """
+    if any(provider._is_async for provider in data_providers):
+        return _run(_gather(provider.evaluate_async(context) for provider in data_providers))
+    if context.executor is not None:
+        _evaluate_operations_in_executor(data_providers, context)
+    return [provider.evaluate(context) for provider in data_providers]
+
+
+def _evaluate_operations_in_executor(data_providers: List[DataProvider], context: EvaluationContext):
+    """
+    Evaluates all operations the data providers consist of, submitting each one to the executor as soon as
+    all of its arguments are evaluated - so tasks never wait for each other and the pool cannot deadlock
+    """
+    operations = {id(op): op for op in all_operations(data_providers) if not context.has_result_of(op)}
+    waiting_for = {op_id: {id(arg) for arg in op.arguments() if id(arg) in operations}
+                   for op_id, op in operations.items()}
+    dependants = defaultdict(list)
+    for op_id, argument_ids in waiting_for.items():
+        for argument_id in argument_ids:
+            dependants[argument_id].append(op_id)
+
+    futures = {}
+
+    def submit(op_id):
+        op = operations[op_id]
+        futures[context.executor.submit(op.evaluate, context)] = op_id
+
+    for op_id, argument_ids in waiting_for.items():
+        if not argument_ids:
+            submit(op_id)
+
+    try:
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                op_id = futures.pop(future)
+                future.result()
+                for dependant_id in dependants[op_id]:
+                    waiting_for[dependant_id].discard(op_id)
+                    if not waiting_for[dependant_id]:
+                        submit(dependant_id)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+async def _gather(awaitables):
+    return await asyncio.gather(*awaitables)
+
+
+def _run(awaitable: Awaitable):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
+
+
+def all_operations(data_providers: List[DataProvider]) -> List[Operation]:
+    """
+    Returns all distinct operations reachable from given data providers (including themselves)
+    """
+    visited = set()
+    operations = []
+    to_visit = list(data_providers)
+    while to_visit:
+        provider = to_visit.pop()
+        if id(provider) in visited:
+            continue
+        visited.add(id(provider))
+        if isinstance(provider, Operation):
+            operations.append(provider)
+        to_visit.extend(provider.arguments())
+    return operations
+
 
 def data_provider(*args: Union[Input, DataProvider], **kwargs: Union[Input, DataProvider]):
     def wrap(f):
@@ -90,6 +403,29 @@ class MethodProxy(Operation):
         return self._op(*args, **kwargs)
 
 
+def process_data_provider(*args: Union[Input, DataProvider], **kwargs: Union[Input, DataProvider]):
+    """
+    Same as data_provider, but the function is going to be run in a pool of processes - so CPU-heavy python code
+    does not block other requests. The function must be defined at the top level of a module - which workers import
+    (again, with spawn / forkserver start methods of multiprocessing), so importing it must not start the server.
+    """
+    def wrap(f):
+        return ProcessMethodProxy(f, *args, **kwargs)
+
+    return wrap
+
+
+class ProcessMethodProxy(MethodProxy):
+    def __init__(self, op, *args, **kwargs):
+        if '<locals>' in op.__qualname__:
+            raise DataProviderOperationException(
+                "Function {} run in a process must be defined at the top level of a module".format(op.__qualname__))
+        super().__init__(op, *args, **kwargs)
+
+    def _call_op(self, args: tuple, kwargs: dict):
+        return run_in_process(self._op.__module__, self._op.__qualname__, args, kwargs)
+
+
 class DashInput(DataProvider):
     def __init__(self, dash_input: Input):
         self._dash_input = dash_input
@@ -100,3 +436,55 @@ class DashInput(DataProvider):
     def depends_on(self) -> Set[Input]:
         return {self._dash_input}
 
+    def key(self) -> str:
+        return _digest('input', self._dash_input.component_id, self._dash_input.component_property)
+
+
+def _call(obj, *args, **kwargs):
+    return obj(*args, **kwargs)
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _function_key(f) -> tuple:
+    module = getattr(f, '__module__', None)
+    qualname = getattr(f, '__qualname__', None)
+    if module is None or qualname is None or '<locals>' in qualname or '<lambda>' in qualname:
+        # there's no name which identifies the function unambiguously
+        return module, qualname, id(f)
+    owner = getattr(f, '__self__', None)
+    if owner is not None and not inspect.ismodule(owner):
+        # methods of different objects compute different things - classes are named, other objects are not
+        return module, qualname, _function_key(owner) if isinstance(owner, type) else _value_key(owner)
+    return module, qualname
+
+
+def _op_token(op):
+    try:
+        hash(op)
+        return op
+    except TypeError:
+        return id(op)
+
+
+def _node_token(provider: DataProvider) -> tuple:
+    """
+    Returns what identifies the argument of an interned operation: operations (and other providers) are shared nodes
+    already, while inputs and (hashable) static values may be repeated in many objects
+    """
+    if isinstance(provider, DashInput):
+        return 'input', provider._dash_input.component_id, provider._dash_input.component_property
+    if isinstance(provider, StaticValueProvider):
+        return ('static', type(provider)) + _value_key(provider.value)
+    return 'node', id(provider)
+
+
+def _value_key(value) -> tuple:
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return type(value).__name__, repr(value)
+    if isinstance(value, (tuple, frozenset)):
+        return (type(value).__name__,) + tuple(_value_key(v) for v in value)
+    return type(value).__name__, id(value)
+
@@ -0,0 +1,175 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Hashable, Union, Optional, Iterable, Callable
+
+from simpledash.data.cache import ResultStore, MISSING
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+_EXTENSIONS = ('.npy', '.arrow', '.pickle')
+
+
+class SharedFileStore(ResultStore):
+    """
+    Keeps results of data providers as files in a local directory, so they can be shared by all processes
+    (e.g. workers of a WSGI server) running on the same host.
+
+    Numpy arrays are saved as .npy files and read back through memory maps, so processes share the pages
+    of a single copy instead of loading their own. Pandas DataFrames are saved as Arrow IPC files (if pyarrow
+    is installed) and also memory mapped - pyarrow avoids copying the columns where it's possible.
+    All other values are pickled.
+
+    Values read from the store are backed by read-only memory maps and must not be modified.
+
+    Keys of data providers don't change when the code or the data they read does, so results are stored
+    under given `namespace` - change it (e.g. to the version of the app or of the data) to stop using old results.
+    Only results of given `providers` are stored, together with the ones `setup_callbacks` passes to
+    `keep_results_of` (data providers put into the layout) - not every intermediate result.
+    Least recently used files are removed once there are more than `max_entries` of them or their total size
+    exceeds `max_bytes` (in the whole directory). Results older than `ttl` seconds are never returned.
+    Results which cannot be serialized are not stored.
+    """
+
+    def __init__(self, directory: Union[str, Path], namespace: str = '', max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None, providers: Iterable = (),
+                 clock: Callable[[], float] = time.time):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._stored_keys = set()
+        self.keep_results_of(providers)
+
+    def stores(self, provider) -> bool:
+        return provider.key() in self._stored_keys
+
+    def keep_results_of(self, data_providers):
+        self._stored_keys.update(provider.key() for provider in data_providers)
+
+    def get(self, key: Hashable):
+        name = self._file_name(key)
+        for extension, read in self._readers():
+            path = self.directory / (name + extension)
+            try:
+                stat = path.stat()
+                if self.ttl is not None and self._clock() - stat.st_mtime > self.ttl:
+                    return MISSING
+                value = read(path)
+                # access time marks recently used results, modification time is kept for ttl
+                os.utime(str(path), (self._clock(), stat.st_mtime))
+                return value
+            except FileNotFoundError:
+                continue
+            except Exception:
+                return MISSING  # e.g. pickled class which doesn't exist anymore
+        return MISSING
+
+    def put(self, key: Hashable, value):
+        name = self._file_name(key)
+        extension, write = self._writer_for(value)
+        # write to a temporary file first, so other processes never see partially written results
+        fd, temp_path = tempfile.mkstemp(dir=str(self.directory), prefix='.' + name)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f, value)
+            now = self._clock()
+            os.utime(temp_path, (now, now))
+            os.replace(temp_path, str(self.directory / (name + extension)))
+        except Exception:
+            os.remove(temp_path)
+            return  # values which cannot be serialized are just not stored
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self._evict()
+
+    def clear(self):
+        for path in self.directory.iterdir():
+            if path.suffix in _EXTENSIONS:
+                path.unlink()
+
+    def _evict(self):
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix in _EXTENSIONS:
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue  # removed by another process
+                entries.append((stat.st_atime, stat.st_size, str(path)))
+        entries.sort(reverse=True)
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and ((self.max_entries is not None and len(entries) > self.max_entries)
+                           or (self.max_bytes is not None and total_bytes > self.max_bytes)):
+            _, size, path = entries.pop()
+            total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _file_name(self, key: Hashable) -> str:
+        return hashlib.sha1(repr((self.namespace, key)).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _readers():
+        readers = [('.npy', _read_numpy)]
+        if pyarrow is not None:
+            readers.append(('.arrow', _read_arrow))
+        readers.append(('.pickle', _read_pickle))
+        return readers
+
+    @staticmethod
+    def _writer_for(value):
+        if numpy is not None and isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+            return '.npy', _write_numpy
+        if pyarrow is not None and isinstance(value, pandas.DataFrame):
+            return '.arrow', _write_arrow
+        return '.pickle', _write_pickle
+
+
+def _write_numpy(f, value):
+    numpy.save(f, value, allow_pickle=False)
+
+
+def _read_numpy(path: Path):
+    return numpy.load(str(path), mmap_mode='r', allow_pickle=False)
+
+
+def _write_arrow(f, value):
+    table = pyarrow.Table.from_pandas(value)
+    with pyarrow.ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_arrow(path: Path):
+    source = pyarrow.memory_map(str(path), 'r')
+    return pyarrow.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+
+
+def _write_pickle(f, value):
+    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_pickle(path: Path):
+    with path.open('rb') as f:
+        return pickle.load(f)
@@ -0,0 +1,123 @@
+import operator
+from typing import List
+
+import numpy
+
+from simpledash.data.data_providers import StaticValueProvider
+from simpledash.data.predicates import _FusedSelection
+
+_LOWER_BOUNDS = {operator.gt: False, operator.ge: True}  # comparison -> is the bound inclusive
+_UPPER_BOUNDS = {operator.lt: False, operator.le: True}
+_FLIPPED = {operator.lt: operator.gt, operator.le: operator.ge, operator.gt: operator.lt, operator.ge: operator.le}
+
+
+class IndexedFrame(StaticValueProvider):
+    """
+    Static DataFrame with sorted indexes of its numeric columns, built once. Selections of its rows by ranges
+    of indexed columns, like
+        flats[flats['area'].between(low, high) & (flats['rent_price'] < max_price)]
+    are answered with binary search: rows of the most selective range are found with `searchsorted`
+    and only they are checked against the other ranges - so filtering does not scan the whole frame.
+    """
+
+    def __init__(self, frame, columns: List[str] = None):
+        super().__init__(frame)
+        if columns is None:
+            columns = [name for name in frame.columns
+                       if isinstance(frame[name].dtype, numpy.dtype) and frame[name].dtype.kind in 'iuf']
+        self._indexes = {name: _ColumnIndex(frame[name].to_numpy()) for name in columns}
+
+
+class _ColumnIndex:
+    def __init__(self, values: numpy.ndarray):
+        if values.dtype.kind not in 'iuf':
+            raise ValueError("Only numeric columns can be indexed, got {}".format(values.dtype))
+        self.values = values
+        order = numpy.argsort(values, kind='stable')
+        # NaNs are sorted to the end and don't satisfy any comparison, so they are left out
+        self.order = order[:len(values) - int(numpy.isnan(values).sum())] if values.dtype.kind == 'f' else order
+        self.sorted_values = values[self.order]
+
+    def positions(self, comparisons: list, operands: tuple) -> slice:
+        """
+        Returns positions (in sorted order) of the values satisfying all the comparisons
+        """
+        start, stop = 0, len(self.sorted_values)
+        for comparison, operand in comparisons:
+            value = operands[operand]
+            if comparison in _LOWER_BOUNDS:
+                side = 'left' if _LOWER_BOUNDS[comparison] else 'right'
+                start = max(start, int(numpy.searchsorted(self.sorted_values, value, side)))
+            else:
+                side = 'right' if _UPPER_BOUNDS[comparison] else 'left'
+                stop = min(stop, int(numpy.searchsorted(self.sorted_values, value, side)))
+        return slice(start, max(start, stop))
+
+
+class _IndexedSelection(_FusedSelection):
+    def __init__(self, tree: tuple, columns: list, expression: str, indexed_frame: IndexedFrame, ranges: dict):
+        super().__init__(tree, columns, expression)
+        self.indexes = indexed_frame._indexes
+        self.ranges = ranges  # column name -> list of (comparison, operand index)
+
+    def __call__(self, frame, *operands):
+        if not all(_is_number(operand) for operand in operands):
+            return super().__call__(frame, *operands)
+
+        positions = {name: self.indexes[name].positions(comparisons, operands)
+                     for name, comparisons in self.ranges.items()}
+        most_selective = min(positions, key=lambda name: positions[name].stop - positions[name].start)
+        rows = self.indexes[most_selective].order[positions[most_selective]]
+        for name, comparisons in self.ranges.items():
+            if name != most_selective:
+                values = self.indexes[name].values[rows]
+                keep = numpy.ones(len(rows), dtype=bool)
+                for comparison, operand in comparisons:
+                    keep &= comparison(values, operands[operand])
+                rows = rows[keep]
+        return frame.take(numpy.sort(rows))
+
+
+def indexed_selection(frame: IndexedFrame, tree: tuple, columns: list, expression: str):
+    """
+    Returns function selecting rows of the frame with its indexes, if the mask is a conjunction of ranges
+    of indexed columns. Otherwise returns None.
+    """
+    ranges = {}
+    for predicate in _conjunction(tree):
+        if predicate[0] == 'between' and predicate[1][0] == 'column' \
+                and predicate[2][0] == 'operand' and predicate[3][0] == 'operand':
+            comparisons = [(operator.ge, predicate[2][1]), (operator.le, predicate[3][1])]
+            column = predicate[1]
+        elif predicate[0] == 'op' and predicate[1] in _FLIPPED:
+            comparison, a, b = predicate[1:]
+            if a[0] == 'operand' and b[0] == 'column':
+                comparison, a, b = _FLIPPED[comparison], b, a
+            if a[0] != 'column' or b[0] != 'operand':
+                return None
+            comparisons = [(comparison, b[1])]
+            column = a
+        else:
+            return None
+        name = columns[column[1]]
+        if name not in frame._indexes:
+            return None
+        ranges.setdefault(name, []).extend(comparisons)
+    return _IndexedSelection(tree, columns, expression, frame, ranges)
+
+
+def _conjunction(tree: tuple) -> list:
+    predicates = []
+    to_visit = [tree]
+    while to_visit:
+        node = to_visit.pop()
+        if node[0] == 'op' and node[1] is operator.and_:
+            to_visit.extend(reversed(node[2:]))
+        else:
+            predicates.append(node)
+    return predicates
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, numpy.integer, numpy.floating)) and not isinstance(value, bool) \
+        and not numpy.isnan(value)
@@ -0,0 +1,176 @@
+import inspect
+import operator
+import threading
+import time
+from collections import deque
+from typing import Dict, Callable
+
+from simpledash.data.cache import size_of
+
+_QUANTILES = (0.5, 0.9, 0.99)
+_MAX_LABEL_LENGTH = 200
+
+
+class ProviderStats:
+    def __init__(self, label: str, sample_size: int):
+        self.label = label
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.latencies = deque(maxlen=sample_size)
+        self.result_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def quantiles(self) -> Dict[float, float]:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {q: 0.0 for q in _QUANTILES}
+        return {q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] for q in _QUANTILES}
+
+    def as_dict(self) -> dict:
+        return dict(
+            label=self.label,
+            calls=self.calls,
+            total_seconds=self.total_seconds,
+            quantiles=self.quantiles(),
+            result_bytes=self.result_bytes,
+            cache_hits=self.cache_hits,
+            cache_misses=self.cache_misses
+        )
+
+
+class Metrics:
+    """
+    Collects per data provider statistics: number of calls, their latency (cumulative and percentiles of the last
+    `sample_size` calls), size of the last result and cache hits / misses.
+    Latency covers only the provider's own function - not evaluation of its arguments.
+    Structurally identical providers (with equal keys) share their statistics.
+    """
+
+    def __init__(self, sample_size: int = 1000):
+        self.sample_size = sample_size
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def measure(self, provider, f: Callable, args: tuple, kwargs: dict):
+        start = time.perf_counter()
+        result = f(*args, **kwargs)
+        if not inspect.isawaitable(result):
+            self._record_call(provider, time.perf_counter() - start, result)
+            return result
+        return self._measure_awaitable(provider, result, start)
+
+    async def _measure_awaitable(self, provider, awaitable, start: float):
+        result = await awaitable
+        self._record_call(provider, time.perf_counter() - start, result)
+        return result
+
+    def record_cache_hit(self, provider):
+        with self._lock:
+            self._stats_of(provider).cache_hits += 1
+
+    def record_cache_miss(self, provider):
+        with self._lock:
+            self._stats_of(provider).cache_misses += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Returns statistics of all the providers evaluated so far, keyed by provider key
+        """
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Returns the statistics in Prometheus text exposition format, labelled with the label and key of providers
+        """
+        lines = []
+
+        def series(name, labels, value):
+            labels = ",".join('{}="{}"'.format(k, _escape(v)) for k, v in labels)
+            lines.append("{}{{{}}} {}".format(name, labels, value))
+
+        def metric(name, metric_type, description, values):
+            lines.append("# HELP {} {}".format(name, description))
+            lines.append("# TYPE {} {}".format(name, metric_type))
+            for labels, value in values:
+                series(name, labels, value)
+
+        # labels of distinct providers may be the same (e.g. flats['x'] of two different flats), keys are not
+        stats = [([('provider', s['label']), ('key', key)], s) for key, s in self.snapshot().items()]
+        metric("simpledash_provider_calls_total", "counter", "Number of data provider calls",
+               [(labels, s['calls']) for labels, s in stats])
+        metric("simpledash_provider_seconds", "summary", "Latency of data provider calls",
+               [(labels + [('quantile', q)], v) for labels, s in stats for q, v in s['quantiles'].items()])
+        for labels, s in stats:
+            series("simpledash_provider_seconds_sum", labels, s['total_seconds'])
+            series("simpledash_provider_seconds_count", labels, s['calls'])
+        metric("simpledash_provider_result_bytes", "gauge", "Size of the last result of data provider",
+               [(labels, s['result_bytes']) for labels, s in stats])
+        metric("simpledash_provider_cache_hits_total", "counter", "Number of data provider results taken from cache",
+               [(labels, s['cache_hits']) for labels, s in stats])
+        metric("simpledash_provider_cache_misses_total", "counter", "Number of data provider results missing in cache",
+               [(labels, s['cache_misses']) for labels, s in stats])
+        return "\n".join(lines) + "\n"
+
+    def register_route(self, server, path: str = '/metrics'):
+        """
+        Exposes the statistics in Prometheus format under given path of the flask server (e.g. app.server)
+        """
+        from flask import Response
+
+        server.add_url_rule(path, 'simpledash_metrics',
+                            lambda: Response(self.to_prometheus(), mimetype='text/plain; version=0.0.4'))
+
+    def _record_call(self, provider, seconds: float, result):
+        result_bytes = size_of(result, deep=False)
+        with self._lock:
+            stats = self._stats_of(provider)
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.latencies.append(seconds)
+            stats.result_bytes = result_bytes
+
+    def _stats_of(self, provider) -> ProviderStats:
+        key = provider.key()
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ProviderStats(describe(provider), self.sample_size)
+        return stats
+
+
+def describe(provider, depth: int = 10) -> str:
+    """
+    Returns human readable label of the provider, like flats_to_display['latitude']
+    """
+    from simpledash.data.data_providers import MethodProxy, Operation, DashInput, StaticValueProvider, _call
+
+    if depth == 0:
+        return "..."
+    if isinstance(provider, MethodProxy):
+        label = provider._op.__qualname__
+    elif isinstance(provider, Operation) and provider._op is getattr:
+        label = "{}.{}".format(describe(provider._args[0], depth - 1), provider._args[1].value)
+    elif isinstance(provider, Operation) and provider._op is operator.getitem:
+        label = "{}[{}]".format(describe(provider._args[0], depth - 1), describe(provider._args[1], depth - 1))
+    elif isinstance(provider, Operation) and provider._op is _call:
+        label = "{}(...)".format(describe(provider._args[0], depth - 1))
+    elif isinstance(provider, Operation):
+        label = getattr(provider._op, '__qualname__', repr(provider._op))
+    elif isinstance(provider, DashInput):
+        label = "Input({})".format(provider._dash_input)
+    elif isinstance(provider, StaticValueProvider):
+        label = repr(provider.value)
+    else:
+        label = type(provider).__name__
+    if len(label) > _MAX_LABEL_LENGTH:
+        label = label[:_MAX_LABEL_LENGTH] + "..."
+    return label
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
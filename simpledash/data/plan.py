@@ -0,0 +1,98 @@
+from typing import List, Dict, Any, Callable
+
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import DataProvider, Operation, DashInput, StaticValueProvider, EvaluationContext
+from simpledash.data.metrics import Metrics
+
+_INPUT = 0
+_CALL = 1
+_CALL_WITH_KWARGS = 2
+_EVALUATE = 3
+
+
+class EvaluationPlan:
+    """
+    Data providers compiled into a flat list of instructions, ordered so that every instruction comes after
+    the ones computing its arguments. Each distinct provider gets a numbered slot for its value, and running
+    the plan is a single loop filling the slots - no recursion and no per-node bookkeeping.
+    Providers other than operations (and inputs or static values) are opaque: they are evaluated as a whole,
+    with their arguments, in a context shared by all of them.
+    """
+
+    def __init__(self, data_providers: List[DataProvider], metrics: Metrics = None):
+        slots = {}
+        self._initial_values = []
+        self._instructions = []
+
+        for provider in topological_order(data_providers, expand=lambda p: isinstance(p, Operation)):
+            slot = len(self._initial_values)
+            slots[id(provider)] = slot
+            self._initial_values.append(provider.value if isinstance(provider, StaticValueProvider) else None)
+
+            if isinstance(provider, StaticValueProvider):
+                continue
+            if isinstance(provider, DashInput):
+                self._instructions.append((_INPUT, slot, provider._dash_input, None, None))
+            elif isinstance(provider, Operation):
+                args = tuple(slots[id(arg)] for arg in provider._args)
+                kwargs = tuple((k, slots[id(arg)]) for k, arg in provider._kwargs.items())
+                self._instructions.append(
+                    (_CALL_WITH_KWARGS if kwargs else _CALL, slot, _callable_of(provider, metrics), args, kwargs))
+            else:
+                self._instructions.append((_EVALUATE, slot, provider, None, None))
+
+        self._outputs = [slots[id(provider)] for provider in data_providers]
+
+    def __len__(self):
+        return len(self._instructions)
+
+    def run(self, context: Dict[Input, Any]) -> List:
+        """
+        Returns values of the data providers the plan was compiled from
+        """
+        values = list(self._initial_values)
+        evaluation_context = None
+        for kind, slot, target, args, kwargs in self._instructions:
+            if kind == _CALL:
+                values[slot] = target(*[values[i] for i in args])
+            elif kind == _INPUT:
+                values[slot] = context[target]
+            elif kind == _CALL_WITH_KWARGS:
+                values[slot] = target(*[values[i] for i in args], **{k: values[i] for k, i in kwargs})
+            else:
+                if evaluation_context is None:
+                    evaluation_context = EvaluationContext(context)
+                values[slot] = target.evaluate(evaluation_context)
+        return [values[i] for i in self._outputs]
+
+
+def topological_order(data_providers: List[DataProvider],
+                      expand: Callable[[DataProvider], bool] = None) -> List[DataProvider]:
+    """
+    Returns all distinct providers reachable from the given ones, each one after all of its arguments
+    (except for arguments of providers not accepted by `expand`, if given)
+    """
+    order = []
+    visited = set()
+    stack = [(provider, False) for provider in reversed(data_providers)]
+    while stack:
+        provider, arguments_visited = stack.pop()
+        if arguments_visited:
+            order.append(provider)
+            continue
+        if id(provider) in visited:
+            continue
+        visited.add(id(provider))
+        stack.append((provider, True))
+        if expand is None or expand(provider):
+            stack.extend((arg, False) for arg in reversed(provider.arguments()))
+    return order
+
+
+def _callable_of(operation: Operation, metrics: Metrics = None):
+    if metrics is not None:
+        return lambda *args, **kwargs: metrics.measure(operation, operation._call_op, (args, kwargs), {})
+    if type(operation)._call_op is Operation._call_op:
+        return operation._op
+    return lambda *args, **kwargs: operation._call_op(args, kwargs)
@@ -0,0 +1,161 @@
+"""
+Fuses row selections like `flats[(flats['area'] > 30) & flats['rent_price'].between(low, high)]` into a single
+operation, which computes the whole mask in one pass over plain numpy arrays of the columns and selects the rows
+once - instead of building an indexed pandas Series (and a copy of the frame) for every comparison.
+"""
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_COMPARISONS = {operator.lt: '<', operator.le: '<=', operator.gt: '>', operator.ge: '>='}
+_LOGICAL = {operator.and_: '&', operator.or_: '|'}
+_ARITHMETIC = {operator.add: '+', operator.sub: '-', operator.mul: '*', operator.truediv: '/'}
+_BINARY = dict(list(_COMPARISONS.items()) + list(_LOGICAL.items()) + list(_ARITHMETIC.items()))
+_PREDICATES = set(_COMPARISONS) | set(_LOGICAL) | {operator.invert}
+
+
+def fused_selection(frame, mask):
+    """
+    Returns operation selecting rows of the frame matching the mask, if the mask is built only of comparisons,
+    logical and arithmetic operators over columns of the frame and other values. Otherwise returns None.
+    """
+    from simpledash.data.data_providers import Operation
+    from simpledash.data.indexed_frame import IndexedFrame, indexed_selection
+
+    if numpy is None or not (isinstance(mask, Operation) and (mask._op in _PREDICATES or _is_between(mask))):
+        return None
+    compiler = _Compiler(frame)
+    tree = compiler.compile(mask)
+    if not compiler.columns:
+        return None
+    expression = compiler.expression(tree)
+    selection = None
+    if isinstance(frame, IndexedFrame):
+        selection = indexed_selection(frame, tree, compiler.columns, expression)
+    if selection is None:
+        selection = _FusedSelection(tree, compiler.columns, expression)
+    return Operation(selection, frame, *compiler.operands)
+
+
+class _FusedSelection:
+    def __init__(self, tree: tuple, columns: list, expression: str):
+        self.tree = tree
+        self.columns = columns
+        # makes the key of the operation structural, as for functions
+        self.__module__ = __name__
+        self.__qualname__ = "select[{}]".format(expression)
+
+    def __call__(self, frame, *operands):
+        columns = [frame[name] for name in self.columns]
+        if not all(_is_plain_column(column) for column in columns) \
+                or not all(numpy.ndim(operand) == 0 for operand in operands):
+            # extension dtypes and non-scalar operands need pandas semantics (missing values, index alignment)
+            return frame[_evaluate(self.tree, columns, operands)]
+        return frame[_evaluate(self.tree, [column.to_numpy() for column in columns], operands)]
+
+    def __repr__(self):
+        return self.__qualname__
+
+    # selections compiled from the same mask are the same function, so their operations are interned together
+    def __eq__(self, other):
+        return type(other) is type(self) and other.__qualname__ == self.__qualname__
+
+    def __hash__(self):
+        return hash((type(self), self.__qualname__))
+
+
+class _Compiler:
+    """
+    Translates tree of operations to a tree of tuples:
+    ('column', i), ('operand', i), ('op', function, *arguments) or ('between', value, low, high)
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.columns = []
+        self.operands = []
+
+    def compile(self, provider) -> tuple:
+        from simpledash.data.data_providers import Operation, StaticValueProvider
+
+        if isinstance(provider, Operation) and not provider._kwargs:
+            if provider._op in _BINARY and len(provider._args) == 2 or provider._op is operator.invert:
+                return self._unless_constant(provider, ('op', provider._op), provider._args)
+            if _is_between(provider):
+                return self._unless_constant(provider, ('between',), (provider._args[0]._args[0],) + provider._args[1:])
+            if provider._op is operator.getitem and provider._args[0] is self.frame \
+                    and isinstance(provider._args[1], StaticValueProvider) \
+                    and isinstance(provider._args[1].value, str):
+                return self._slot(self.columns, 'column', provider._args[1].value)
+        return self._slot(self.operands, 'operand', provider)
+
+    def _unless_constant(self, provider, node: tuple, arguments) -> tuple:
+        """
+        Returns the node with compiled arguments - or the whole provider as an operand, if it doesn't use
+        any column (like `low + 10`), as such values are the same for all the rows
+        """
+        operands_count = len(self.operands)
+        arguments = tuple(self.compile(arg) for arg in arguments)
+        if all(argument[0] == 'operand' for argument in arguments):
+            del self.operands[operands_count:]
+            return self._slot(self.operands, 'operand', provider)
+        return node + arguments
+
+    @staticmethod
+    def _slot(slots: list, kind: str, value) -> tuple:
+        for i, existing in enumerate(slots):
+            if existing is value or (kind == 'column' and existing == value):
+                return kind, i
+        slots.append(value)
+        return kind, len(slots) - 1
+
+    def expression(self, tree: tuple) -> str:
+        """
+        Returns readable form of the mask, like ((frame['area'] >= $0) & (frame['area'] <= $1))
+        """
+        return _expression(tree, lambda i: "frame[{!r}]".format(self.columns[i]), "${}".format)
+
+
+def _expression(tree: tuple, column, operand) -> str:
+    kind = tree[0]
+    if kind == 'column':
+        return column(tree[1])
+    if kind == 'operand':
+        return operand(tree[1])
+    arguments = [_expression(argument, column, operand) for argument in tree[2 if kind == 'op' else 1:]]
+    if kind == 'between':
+        return "(({0} >= {1}) & ({0} <= {2}))".format(*arguments)
+    if tree[1] is operator.invert:
+        return "(~{})".format(arguments[0])
+    return "({} {} {})".format(arguments[0], _BINARY[tree[1]], arguments[1])
+
+
+def _evaluate(tree: tuple, columns: list, operands: tuple):
+    kind = tree[0]
+    if kind == 'column':
+        return columns[tree[1]]
+    if kind == 'operand':
+        return operands[tree[1]]
+    if kind == 'between':
+        value, low, high = (_evaluate(argument, columns, operands) for argument in tree[1:])
+        return (value >= low) & (value <= high)
+    return tree[1](*(_evaluate(argument, columns, operands) for argument in tree[2:]))
+
+
+def _is_between(provider) -> bool:
+    from simpledash.data.data_providers import Operation, StaticValueProvider, _call
+
+    if not (isinstance(provider, Operation) and provider._op is _call and len(provider._args) == 3
+            and not provider._kwargs):
+        return False
+    method = provider._args[0]
+    return isinstance(method, Operation) and method._op is getattr \
+        and isinstance(method._args[1], StaticValueProvider) and method._args[1].value == 'between'
+
+
+def _is_plain_column(column) -> bool:
+    return isinstance(getattr(column, 'dtype', None), numpy.dtype) and hasattr(column, 'to_numpy')
+
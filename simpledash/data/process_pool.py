@@ -0,0 +1,185 @@
+"""
+Runs functions of data providers in a pool of processes. Large numpy arrays and pandas objects are passed
+to and from the workers through shared memory, instead of being pickled.
+
+Workers find the functions by importing their modules. With spawn / forkserver start methods of multiprocessing
+(the default on macOS, Windows and with python>=3.14) this also imports the module of the app again in every worker,
+so only the parent process starts the pool - and the app must not start the server on import
+(run it under `if __name__ == '__main__'`).
+"""
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Optional
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # python < 3.8
+    shared_memory = None
+
+try:
+    import numpy
+    import pandas
+except ImportError:
+    numpy = None
+
+SHARED_MEMORY_THRESHOLD = 1 << 20  # arrays smaller than that are simply pickled
+
+_pool = None
+_pool_size = None
+_pool_lock = threading.Lock()
+
+
+def process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Returns the pool shared by all process data providers, creating it if needed
+    """
+    global _pool, _pool_size
+    if in_worker_process():
+        raise RuntimeError("Process pool can be started only by the parent process, not by its workers")
+    with _pool_lock:
+        if _pool is None:
+            _pool_size = max_workers or os.cpu_count() or 1
+            _pool = ProcessPoolExecutor(max_workers=_pool_size)
+        return _pool
+
+
+def warm_up_process_pool(max_workers: Optional[int] = None):
+    """
+    Starts all the worker processes, so the first request doesn't have to wait for them.
+    Does nothing in the workers themselves (e.g. when they import the module of the app calling setup_callbacks)
+    """
+    if in_worker_process():
+        return
+    pool = process_pool(max_workers)
+    wait([pool.submit(_noop) for _ in range(_pool_size)])
+
+
+def in_worker_process() -> bool:
+    # parent_process() is not set yet while spawned workers import the main module, but the name of the process is
+    return multiprocessing.current_process().name != 'MainProcess'
+
+
+def shutdown_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def run_in_process(module: str, qualname: str, args: tuple, kwargs: dict):
+    """
+    Runs function identified by module and qualified name in the process pool and returns its result
+    """
+    blocks = []
+    try:
+        shared_args = tuple(_share(arg, blocks) for arg in args)
+        shared_kwargs = {k: _share(arg, blocks) for k, arg in kwargs.items()}
+        result = process_pool().submit(_run, module, qualname, shared_args, shared_kwargs).result()
+        return _unshare(result, unlink=True)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _noop():
+    pass
+
+
+def _run(module: str, qualname: str, args: tuple, kwargs: dict):
+    function = _resolve(module, qualname)
+    args = tuple(_unshare(arg) for arg in args)
+    kwargs = {k: _unshare(arg) for k, arg in kwargs.items()}
+    blocks = []
+    result = _share(function(*args, **kwargs), blocks)
+    for block in blocks:
+        # the parent process reads and unlinks the result, so this process must not clean it up
+        _untrack(block)
+        block.close()
+    return result
+
+
+def _resolve(module: str, qualname: str):
+    from simpledash.data.data_providers import MethodProxy
+
+    obj = importlib.import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    # module attribute is the data provider wrapping the function, not the function itself
+    return obj._op if isinstance(obj, MethodProxy) else obj
+
+
+class _SharedArray:
+    def __init__(self, name: str, shape: tuple, dtype: str):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+
+class _SharedSeries:
+    def __init__(self, values, index, name):
+        self.values = values
+        self.index = index
+        self.name = name
+
+
+class _SharedFrame:
+    def __init__(self, columns: list, names: list, index):
+        self.columns = columns
+        self.names = names
+        self.index = index
+
+
+def _share(value, blocks: list):
+    if shared_memory is None or numpy is None:
+        return value
+    if isinstance(value, numpy.ndarray):
+        if value.dtype.hasobject or value.nbytes < SHARED_MEMORY_THRESHOLD:
+            return value
+        block = shared_memory.SharedMemory(create=True, size=value.nbytes)
+        blocks.append(block)
+        numpy.ndarray(value.shape, value.dtype, buffer=block.buf)[...] = value
+        return _SharedArray(block.name, value.shape, value.dtype.str)
+    if isinstance(value, pandas.Series):
+        return _SharedSeries(_share_column(value, blocks), value.index, value.name)
+    if isinstance(value, pandas.DataFrame) and value.columns.is_unique:
+        columns = [_share_column(value[name], blocks) for name in value.columns]
+        return _SharedFrame(columns, list(value.columns), value.index)
+    return value
+
+
+def _share_column(series, blocks: list):
+    if isinstance(series.dtype, numpy.dtype):
+        return _share(series.to_numpy(), blocks)
+    return series.array  # extension arrays (categories, timezones...) are pickled
+
+
+def _unshare(value, unlink: bool = False):
+    if isinstance(value, _SharedArray):
+        block = shared_memory.SharedMemory(name=value.name)
+        try:
+            return numpy.ndarray(value.shape, numpy.dtype(value.dtype), buffer=block.buf).copy()
+        finally:
+            block.close()
+            if unlink:
+                block.unlink()
+    if isinstance(value, _SharedSeries):
+        return pandas.Series(_unshare(value.values, unlink), index=value.index, name=value.name)
+    if isinstance(value, _SharedFrame):
+        columns = {i: _unshare(column, unlink) for i, column in enumerate(value.columns)}
+        frame = pandas.DataFrame(columns, index=value.index, copy=False)
+        frame.columns = value.names
+        return frame
+    return value
+
+
+def _untrack(block):
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, 'shared_memory')
+    except (ImportError, AttributeError):
+        pass
@@ -1,15 +1,38 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple, Any, Optional
+
+_KEY = 0
+_TUPLE = 1
+_PROPERTY = 2
+
+Step = Tuple[int, Any]
 
 
 class Accessor:
+    __slots__ = ()
+
     def get(self, obj):
         raise NotImplementedError
 
     def set(self, obj, value):
         raise NotImplementedError
 
+    def path(self) -> List:
+        """
+        Returns keys leading to the accessed value
+        """
+        raise NotImplementedError
+
+    def steps(self) -> Tuple[Step, ...]:
+        """
+        Returns (kind, key) pairs leading to the accessed value
+        """
+        raise NotImplementedError
+
 
 class PropertyAccessor(Accessor):
+    __slots__ = ('property_name',)
+
     def __init__(self, property_name: str):
         self.property_name = property_name
 
@@ -20,11 +43,19 @@ class PropertyAccessor(Accessor):
         setattr(obj, self.property_name, value)
         return obj
 
+    def path(self) -> List:
+        return [self.property_name]
+
+    def steps(self) -> Tuple[Step, ...]:
+        return (_PROPERTY, self.property_name),
+
     def __repr__(self):
         return ".{}".format(self.property_name)
 
 
 class KeyAccessor(Accessor):
+    __slots__ = ('index',)
+
     def __init__(self, index):
         self.index = index
 
@@ -35,32 +66,51 @@ class KeyAccessor(Accessor):
         obj[self.index] = value
         return obj
 
+    def path(self) -> List:
+        return [self.index]
+
+    def steps(self) -> Tuple[Step, ...]:
+        return (_KEY, self.index),
+
     def __repr__(self):
         return "[{}]".format(self.index)
 
 
 class TupleAccessor(KeyAccessor):
+    __slots__ = ()
+
     def set(self, obj, value):
-        obj = list(obj)
-        obj[self.index] = value
-        return tuple(obj)
+        return _replaced(obj, self.index, value)
+
+    def steps(self) -> Tuple[Step, ...]:
+        return (_TUPLE, self.index),
 
     def __repr__(self):
         return "({})".format(self.index)
 
 
 class DummyAccessor(Accessor):
+    __slots__ = ()
+
     def get(self, obj):
         return obj
 
     def set(self, obj, value):
         return value
 
+    def path(self) -> List:
+        return []
+
+    def steps(self) -> Tuple[Step, ...]:
+        return ()
+
     def __repr__(self):
         return ""
 
 
 class NestedAccessor(Accessor):
+    __slots__ = ('a', 'b')
+
     def __init__(self, a: Accessor, b: Accessor):
         self.a = a
         self.b = b
@@ -73,11 +123,152 @@ class NestedAccessor(Accessor):
         new_inner = self.b.set(inner, value)
         return self.a.set(obj, new_inner)
 
+    def path(self) -> List:
+        return self.a.path() + self.b.path()
+
+    def steps(self) -> Tuple[Step, ...]:
+        return self.a.steps() + self.b.steps()
+
     @classmethod
     def from_list(cls, ls: List[Accessor]) -> Accessor:
+        """
+        Returns accessor going through all the given ones - as a flat PathAccessor, if all of them are known
+        """
+        try:
+            return PathAccessor(sum((accessor.steps() for accessor in ls), ()))
+        except NotImplementedError:
+            return cls._chain(ls)
+
+    @classmethod
+    def _chain(cls, ls: List[Accessor]) -> Accessor:
         if len(ls) == 1:
             return ls[0]
-        return NestedAccessor(ls[0], cls.from_list(ls[1:]))
+        return NestedAccessor(ls[0], cls._chain(ls[1:]))
 
     def __repr__(self):
         return "{}{}".format(repr(self.a), repr(self.b))
+
+
+class PathAccessor(Accessor):
+    """
+    Accessor going through a path of keys, tuple indexes and properties, kept as a flat tuple of steps
+    """
+    __slots__ = ('_steps', '_head', '_tail')
+
+    def __init__(self, steps: Tuple[Step, ...]):
+        self._steps = tuple(steps)
+        # containers down the head are modified in place - only the trailing tuples (and the container
+        # of the outermost one) are rebuilt, as a tuple holding a modified component is still the same tuple
+        in_place = len(self._steps) - 1
+        while in_place > 0 and self._steps[in_place][0] == _TUPLE:
+            in_place -= 1
+        in_place = max(in_place, 0)
+        self._head = self._steps[:in_place]
+        self._tail = self._steps[in_place:]
+
+    def get(self, obj):
+        for kind, key in self._steps:
+            obj = getattr(obj, key) if kind == _PROPERTY else obj[key]
+        return obj
+
+    def set(self, obj, value):
+        if not self._tail:
+            return value
+        container = obj
+        for kind, key in self._head:
+            container = getattr(container, key) if kind == _PROPERTY else container[key]
+        container = _set_path(container, self._tail, 0, value)
+        return obj if self._head else container
+
+    def path(self) -> List:
+        return [key for _, key in self._steps]
+
+    def steps(self) -> Tuple[Step, ...]:
+        return self._steps
+
+    def __repr__(self):
+        return "".join(
+            ".{}".format(key) if kind == _PROPERTY else "({})".format(key) if kind == _TUPLE else "[{}]".format(key)
+            for kind, key in self._steps)
+
+
+def set_all(obj, accessors: List[Accessor], values: List):
+    """
+    Sets values under paths of the accessors. If any of them goes through tuples, it's done in a single pass over
+    a prefix tree of the paths - so every tuple on the way is copied once, no matter how many values are set
+    inside of it. If one path is a prefix of another, values are set one by one, in order.
+    """
+    tree = _prefix_tree(tuple(accessors))
+    if tree is None:
+        return _set_one_by_one(obj, accessors, values)
+    return _set_tree(obj, tree, values)
+
+
+@lru_cache(maxsize=1024)
+def _prefix_tree(accessors: Tuple[Accessor, ...]) -> Optional[dict]:
+    """
+    Returns tree of steps of the accessors, with indexes of their values in leaves - or None, if the values
+    should be set one by one
+    """
+    if all(isinstance(accessor, PathAccessor) and len(accessor._tail) == 1 for accessor in accessors):
+        return None  # nothing is copied, so one by one every container is modified just as well
+    root = {}
+    for i, accessor in enumerate(accessors):
+        steps = accessor.steps()
+        if not steps:
+            return None
+        node = root
+        for step in steps[:-1]:
+            node = node.setdefault(step, {})
+            if not isinstance(node, dict):
+                return None
+        if steps[-1] in node:
+            return None
+        node[steps[-1]] = i
+    return root
+
+
+def _set_tree(obj, node: dict, values: List):
+    if isinstance(obj, tuple):
+        items = list(obj)
+        for (_, key), child in node.items():
+            items[key] = _set_tree(items[key], child, values) if isinstance(child, dict) else values[child]
+        return tuple(items)
+    for (kind, key), child in node.items():
+        if isinstance(child, dict):
+            inner = getattr(obj, key) if kind == _PROPERTY else obj[key]
+            new_inner = _set_tree(inner, child, values)
+            if new_inner is not inner:
+                obj = _set(kind, obj, key, new_inner)
+        else:
+            obj = _set(kind, obj, key, values[child])
+    return obj
+
+
+def _set_one_by_one(obj, accessors: List[Accessor], values: List):
+    for accessor, value in zip(accessors, values):
+        obj = accessor.set(obj, value)
+    return obj
+
+
+def _set_path(obj, steps: Tuple[Step, ...], i: int, value):
+    kind, key = steps[i]
+    if i + 1 < len(steps):
+        value = _set_path(getattr(obj, key) if kind == _PROPERTY else obj[key], steps, i + 1, value)
+    return _set(kind, obj, key, value)
+
+
+def _set(kind: int, obj, key, value):
+    if kind == _TUPLE:
+        return _replaced(obj, key, value)
+    if kind == _PROPERTY:
+        setattr(obj, key, value)
+    else:
+        obj[key] = value
+    return obj
+
+
+def _replaced(items: tuple, index: int, value) -> tuple:
+    items = list(items)
+    items[index] = value
+    return tuple(items)
@@ -6,6 +6,7 @@ from dash.development.base_component import Component
 
 from simpledash.data.data_providers import DataProvider
 from simpledash.inspector.accessors import Accessor, KeyAccessor, TupleAccessor, DummyAccessor, NestedAccessor
+from simpledash.inspector.layout import property_names
 
 
 class DataProviderWithAccessor:
@@ -16,31 +17,37 @@ class DataProviderWithAccessor:
 
 def find_data_providers(component: Component) -> Dict[str, List[DataProviderWithAccessor]]:
     proxies = defaultdict(list)
-    for attr, attr_value in component.__dict__.items():
-        for proxy in _find_data_providers(attr_value):
+    for attr in property_names(component):
+        for proxy in _find_data_providers(component.__dict__[attr]):
             proxies[attr].append(proxy)
     return proxies
 
 
-def _find_data_providers(obj, root_accessor: Accessor = None) -> List[DataProviderWithAccessor]:
-    root_accessor = root_accessor or DummyAccessor()
-
-    def data_providers_in(iterator, accessor_clazz):
-        data = []
-        for k, v in iterator:
-            data += _find_data_providers(v, NestedAccessor(root_accessor, accessor_clazz(k)))
-        return data
-
-    if isinstance(obj, (DataProvider, Input)):
-        return [DataProviderWithAccessor(DataProvider.to_provider(obj), root_accessor)]
-
-    if isinstance(obj, dict):
-        return data_providers_in(obj.items(), KeyAccessor)
-
-    if isinstance(obj, list):
-        return data_providers_in(enumerate(obj), KeyAccessor)
-
-    if isinstance(obj, tuple):
-        return data_providers_in(enumerate(obj), TupleAccessor)
-
-    return []
+def _find_data_providers(obj) -> List[DataProviderWithAccessor]:
+    """
+    Finds data providers nested in dicts, lists and tuples. Accessors are built only for the found providers,
+    from the (linked) path of keys collected on the way down.
+    """
+    data_providers = []
+    stack = [(obj, None)]
+    while stack:
+        obj, path = stack.pop()
+        if isinstance(obj, (DataProvider, Input)):
+            data_providers.append(DataProviderWithAccessor(DataProvider.to_provider(obj), _accessor_of(path)))
+        elif isinstance(obj, dict):
+            stack.extend((v, (path, KeyAccessor, k)) for k, v in reversed(list(obj.items())))
+        elif isinstance(obj, list):
+            stack.extend((v, (path, KeyAccessor, i)) for i, v in reversed(list(enumerate(obj))))
+        elif isinstance(obj, tuple):
+            stack.extend((v, (path, TupleAccessor, i)) for i, v in reversed(list(enumerate(obj))))
+    return data_providers
+
+
+def _accessor_of(path) -> Accessor:
+    accessors = []
+    while path is not None:
+        path, accessor_clazz, key = path
+        accessors.append(accessor_clazz(key))
+    if not accessors:
+        return DummyAccessor()
+    return NestedAccessor.from_list(list(reversed(accessors)))
@@ -0,0 +1,196 @@
+"""
+Static analysis of the data providers behind callbacks set up by `setup_callbacks`: which callbacks evaluate which
+providers, which inputs trigger which outputs and how many times each provider is computed when an input changes.
+Providers computed by several callbacks fired by the same input are candidates for `cache` or `group_callbacks`.
+"""
+import json
+import weakref
+from collections import OrderedDict
+from typing import List, Dict, Set
+
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import DataProvider, DashInput, StaticValueProvider
+from simpledash.data.metrics import describe
+from simpledash.data.plan import topological_order
+
+_CALLBACKS = weakref.WeakKeyDictionary()  # app -> callbacks set up for it
+
+
+class RegisteredCallback:
+    def __init__(self, targets: list, inputs: List[Input], clientside: bool = False):
+        self.targets = targets  # (component, property, data providers with accessors)
+        self.inputs = inputs
+        self.clientside = clientside
+
+    def outputs(self) -> List[Input]:
+        return [Input(component.id, component_property) for component, component_property, _ in self.targets]
+
+    def data_providers(self, triggered: Set[Input] = None) -> List[DataProvider]:
+        """
+        Returns data providers evaluated by the callback when given inputs are triggered (all of them, if not given)
+        """
+        return [p.data_provider for _, _, data_providers in self.targets for p in data_providers
+                if triggered is None or p.data_provider.depends_on() & triggered]
+
+
+def register_callback(app, targets: list, inputs: List[Input], clientside: bool = False):
+    _CALLBACKS.setdefault(app, []).append(RegisteredCallback(targets, inputs, clientside))
+
+
+def provider_graph(app) -> 'ProviderGraph':
+    """
+    Returns graph of data providers of all the callbacks set up for the app by `setup_callbacks`
+    """
+    return ProviderGraph(_CALLBACKS.get(app, []))
+
+
+class ProviderGraph:
+    """
+    Data providers of the callbacks (structurally identical ones, with equal keys, are a single node),
+    the inputs triggering them and the outputs they are put into.
+    A change of an input fires every callback depending on it - and then the ones depending on outputs of those.
+    Each of the fired callbacks evaluates the providers depending on its changed inputs, together with all their
+    arguments, once - so a provider shared by n of them is computed n times per change (unless it's cached).
+    """
+
+    def __init__(self, callbacks: List[RegisteredCallback]):
+        self.callbacks = callbacks
+        self._providers = OrderedDict()  # key -> provider
+        for callback in callbacks:
+            for provider in _computed(callback.data_providers()):
+                self._providers.setdefault(provider.key(), provider)
+
+    def inputs(self) -> List[Input]:
+        inputs = OrderedDict((inp, None) for callback in self.callbacks for inp in callback.inputs)
+        return list(inputs)
+
+    def fired_callbacks(self, inp: Input) -> Dict[int, Set[Input]]:
+        """
+        Returns indexes of callbacks fired by a change of the input, together with their inputs changed then
+        """
+        changed = {inp}
+        fired = OrderedDict()
+        while True:
+            for i, callback in enumerate(self.callbacks):
+                triggered = changed.intersection(callback.inputs)
+                if triggered:
+                    fired[i] = triggered
+            outputs = {output for i in fired for output in self.callbacks[i].outputs()}
+            if outputs <= changed:
+                return fired
+            changed |= outputs
+
+    def evaluations(self, inp: Input) -> Dict[str, List[int]]:
+        """
+        Returns keys of providers computed after a change of the input, with indexes of callbacks computing them
+        (once per computation)
+        """
+        evaluations = OrderedDict()
+        for i, triggered in self.fired_callbacks(inp).items():
+            # distinct (even if structurally identical) providers are computed separately within a callback too
+            for provider in _computed(self.callbacks[i].data_providers(triggered)):
+                if not isinstance(provider, DashInput):
+                    evaluations.setdefault(provider.key(), []).append(i)
+        return evaluations
+
+    def redundant(self) -> List[dict]:
+        """
+        Returns providers computed more than once per change of an input, most recomputed first
+        """
+        redundant = [
+            dict(provider=key, label=describe(self._providers[key]), input=_name(inp),
+                 evaluations=len(callbacks), callbacks=[_callback_id(i) for i in OrderedDict.fromkeys(callbacks)])
+            for inp in self.inputs() for key, callbacks in self.evaluations(inp).items() if len(callbacks) > 1
+        ]
+        return sorted(redundant, key=lambda r: -r['evaluations'])
+
+    def as_dict(self) -> dict:
+        evaluations = {inp: self.evaluations(inp) for inp in self.inputs()}
+        fan_out = OrderedDict((key, OrderedDict()) for key in self._providers)
+        for callback in self.callbacks:
+            for component, component_property, data_providers in callback.targets:
+                for provider in _computed([p.data_provider for p in data_providers]):
+                    fan_out[provider.key()][_name(Input(component.id, component_property))] = None
+        return dict(
+            providers=[
+                dict(key=key, label=describe(provider), input=isinstance(provider, DashInput),
+                     arguments=[arg.key() for arg in _computed(provider.arguments(), recursive=False)],
+                     depends_on=sorted(_name(inp) for inp in provider.depends_on()),
+                     outputs=list(fan_out[key]),
+                     evaluations={_name(inp): len(evaluations[inp][key])
+                                  for inp in self.inputs() if key in evaluations[inp]})
+                for key, provider in self._providers.items()
+            ],
+            callbacks=[
+                dict(id=_callback_id(i), clientside=callback.clientside,
+                     inputs=[_name(inp) for inp in callback.inputs],
+                     outputs=[_name(output) for output in callback.outputs()],
+                     providers=list(OrderedDict((p.key(), None) for p in _computed(callback.data_providers()))))
+                for i, callback in enumerate(self.callbacks)
+            ],
+            inputs=[
+                dict(input=_name(inp), callbacks=[_callback_id(i) for i in fired],
+                     outputs=[_name(output) for i in fired for output in self.callbacks[i].outputs()])
+                for inp, fired in ((inp, self.fired_callbacks(inp)) for inp in self.inputs())
+            ],
+            redundant=self.redundant()
+        )
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_dot(self) -> str:
+        """
+        Returns the graph in Graphviz dot format. Providers computed more than once per change of an input are red
+        """
+        recomputed = {}
+        for r in self.redundant():
+            recomputed.setdefault(r['provider'], r)
+        lines = ["digraph providers {", "    rankdir=LR;", "    node [shape=box];"]
+        for key, provider in self._providers.items():
+            label = describe(provider)
+            attributes = ""
+            if isinstance(provider, DashInput):
+                label, attributes = _name(provider._dash_input), ", shape=ellipse, style=filled, fillcolor=lightblue"
+            elif key in recomputed:
+                label += "\n{evaluations}x per change of {input}".format(**recomputed[key])
+                attributes = ", color=red, fontcolor=red"
+            lines.append('    "{}" [label="{}"{}];'.format(_node_id(provider), _escape(label), attributes))
+            for arg in _computed(provider.arguments(), recursive=False):
+                lines.append('    "{}" -> "{}";'.format(_node_id(arg), _node_id(provider)))
+        for i, callback in enumerate(self.callbacks):
+            # outputs used as inputs of other callbacks are the same nodes as these inputs
+            for output in callback.outputs():
+                lines.append('    "{}" [label="{}", shape=note];'.format(
+                    _escape(_name(output)), _escape("{}\n{}".format(_name(output), _callback_id(i)))))
+            for component, component_property, data_providers in callback.targets:
+                output = _escape(_name(Input(component.id, component_property)))
+                for node_id in OrderedDict((_node_id(p.data_provider), None) for p in data_providers):
+                    lines.append('    "{}" -> "{}";'.format(node_id, output))
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+
+def _computed(data_providers: List[DataProvider], recursive: bool = True) -> List[DataProvider]:
+    """
+    Returns the providers (with all their arguments, if recursive) except for static values
+    """
+    providers = topological_order(data_providers) if recursive else data_providers
+    return [provider for provider in providers if not isinstance(provider, StaticValueProvider)]
+
+
+def _node_id(provider: DataProvider) -> str:
+    return _escape(_name(provider._dash_input)) if isinstance(provider, DashInput) else provider.key()
+
+
+def _callback_id(i: int) -> str:
+    return "callback-{}".format(i)
+
+
+def _name(inp: Input) -> str:
+    return "{}.{}".format(inp.component_id, inp.component_property)
+
+
+def _escape(label: str) -> str:
+    return label.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -2,10 +2,40 @@ from dash.development.base_component import Component
 
 
 def find_all_components(component: Component):
-    children = getattr(component, 'children', [])
-    children = children if isinstance(children, list) else [children]
-    for child in children:
-        if isinstance(child, Component):
-            for descendant in find_all_components(child):
-                yield descendant
-    yield component
+    """
+    Yields all components of the layout (including the ones nested in properties other than children),
+    each one after all of its descendants
+    """
+    stack = [(component, False)]
+    while stack:
+        obj, descendants_visited = stack.pop()
+        if descendants_visited:
+            yield obj
+            continue
+        stack.append((obj, True))
+        stack.extend((child, False) for child in reversed(_child_components(obj)))
+
+
+def _child_components(component: Component):
+    children = []
+    values = [component.__dict__[prop] for prop in property_names(component)]
+    while values:
+        value = values.pop()
+        if isinstance(value, Component):
+            children.append(value)
+        elif isinstance(value, (list, tuple)):
+            values.extend(value)
+        elif isinstance(value, dict):
+            values.extend(value.values())
+    children.reverse()
+    return children
+
+
+_NON_PROPERTY_ATTRIBUTES = {'available_properties', 'available_wildcard_properties'}
+
+
+def property_names(component: Component):
+    """
+    Returns names of properties set on the component
+    """
+    return [name for name in component.__dict__ if not name.startswith('_') and name not in _NON_PROPERTY_ATTRIBUTES]
@@ -0,0 +1,53 @@
+import asyncio
+
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import data_provider, EvaluationContext, evaluate_all
+
+input_a = Input('a', 'x')
+input_b = Input('b', 'x')
+
+
+def _recording_provider(events, name, *inputs):
+    @data_provider(*inputs)
+    async def provider(*values):
+        events.append("start " + name)
+        await asyncio.sleep(0.01)
+        events.append("end " + name)
+        return name + "".join(str(v) for v in values)
+
+    return provider
+
+
+def test_evaluates_independent_branches_concurrently():
+    events = []
+    a = _recording_provider(events, "a", input_a)
+    b = _recording_provider(events, "b", input_b)
+
+    @data_provider(a, b)
+    def combined(a_value, b_value):
+        return a_value + b_value
+
+    assert combined.evaluate({input_a: 1, input_b: 2}) == "a1b2"
+    assert events[:2] == ["start a", "start b"]
+
+
+def test_evaluates_shared_async_data_provider_once():
+    events = []
+    shared = _recording_provider(events, "shared", input_a)
+
+    context = EvaluationContext({input_a: 1})
+    assert evaluate_all([shared.upper(), shared[0], shared], context) == ["SHARED1", "s", "shared1"]
+    assert events == ["start shared", "end shared"]
+
+
+def test_mixes_sync_and_async_data_providers():
+    events = []
+    async_provider = _recording_provider(events, "async", input_a)
+
+    @data_provider(async_provider, input_b)
+    def sync_provider(a, b):
+        return "{} {}".format(a, b)
+
+    assert evaluate_all([sync_provider, async_provider], EvaluationContext({input_a: 1, input_b: 2})) == \
+        ["async1 2", "async1"]
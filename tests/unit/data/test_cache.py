@@ -0,0 +1,77 @@
+from unittest.mock import Mock
+
+import pandas
+from dash.dependencies import Input
+
+from simpledash.data.cache import ResultCache, MISSING, cache_key
+from simpledash.data.data_providers import data_provider, EvaluationContext
+
+input_a = Input('a', 'x')
+input_b = Input('b', 'x')
+
+
+def test_returns_cached_result_for_the_same_input_values():
+    function = Mock(side_effect=lambda a: a * 2)
+    provider = data_provider(input_a)(function)
+    cache = ResultCache()
+
+    assert provider.evaluate(EvaluationContext({input_a: 1}, cache)) == 2
+    assert provider.evaluate(EvaluationContext({input_a: 2}, cache)) == 4
+    assert provider.evaluate(EvaluationContext({input_a: 1, input_b: 10}, cache)) == 2
+    assert function.call_count == 2
+
+
+def test_cache_key_handles_unhashable_input_values():
+    provider = data_provider(input_a, input_b)(Mock())
+
+    key = cache_key(provider, {input_a: [1, {"x": [2]}], input_b: None})
+    assert key == cache_key(provider, {input_a: [1, {"x": [2]}], input_b: None})
+    assert key != cache_key(provider, {input_a: (1, {"x": [2]}), input_b: None})
+
+
+def test_cache_key_distinguishes_equal_values_of_different_types():
+    function = Mock(side_effect=lambda a: repr(a))
+    provider = data_provider(input_a)(function)
+    cache = ResultCache()
+
+    values = [True, 1, 1.0, [1], [True], {1: "x"}, {True: "x"}]
+    assert [provider.evaluate(EvaluationContext({input_a: v}, cache)) for v in values] == [repr(v) for v in values]
+    assert function.call_count == len(values)
+
+
+def test_evicts_least_recently_used_entries():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_evicts_entries_exceeding_byte_budget():
+    frame = pandas.DataFrame({"x": range(1000)})
+    size = int(frame.memory_usage(deep=True).sum())
+    cache = ResultCache(max_bytes=int(size * 2.5))
+    for key in "abc":
+        cache.put(key, frame)
+
+    assert cache.get("a") is MISSING
+    assert cache.total_bytes == 2 * size
+
+    cache.put("too-big", pandas.concat([frame] * 3))
+    assert cache.get("too-big") is MISSING
+    assert len(cache) == 2
+
+
+def test_expires_entries_after_ttl():
+    now = [0]
+    cache = ResultCache(ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+
+    now[0] = 10
+    assert cache.get("a") == 1
+    now[0] = 11
+    assert cache.get("a") is MISSING
@@ -1,8 +1,10 @@
 import pytest
+from unittest.mock import Mock
+
 from dash.dependencies import Input
 
 from simpledash.data.data_providers import DataProvider, DataProviderOperationException, StaticValueProvider, \
-    DashInput
+    DashInput, data_provider, EvaluationContext
 
 dummy_data_provider = DataProvider()
 input_a = Input('a', 'x')
@@ -23,6 +25,26 @@ def test_evaluates_data_provider():
     assert provider.evaluate({input_a: [["AAA"]], input_b: 0}) == "aaa"
 
 
+def test_evaluates_shared_data_provider_once_per_context():
+    function = Mock(return_value="abc")
+    shared = data_provider(input_a)(function)
+    provider = shared.upper().replace(shared[0].upper(), shared[2])
+
+    context = EvaluationContext({input_a: "x"})
+    assert provider.evaluate(context) == "cBC"
+    assert shared.lower().evaluate(context) == "abc"
+    function.assert_called_once_with("x")
+
+
+def test_evaluates_operators_lazily():
+    a, b = DashInput(input_a), DashInput(input_b)
+    provider = ((a + 1) * 2 - b / 2 > 5) | (1 + a >= b) & (3 * b <= 14) & (a < 10)
+
+    assert provider.depends_on() == {input_a, input_b}
+    assert provider.evaluate({input_a: 4, input_b: 4}) is True
+    assert provider.evaluate({input_a: 2, input_b: 4}) is False
+
+
 def test_raises_for_conditional_on_data_provider():
     with pytest.raises(DataProviderOperationException):
         if dummy_data_provider:
@@ -42,3 +64,44 @@ def test_raises_when_comparing_data_provider_to_anything_else():
 def test_raises_when_assigning_to_data_provider():
     with pytest.raises(DataProviderOperationException):
         dummy_data_provider[10] = "aa"
+
+
+def test_data_providers_built_the_same_way_have_equal_keys():
+    assert DashInput(input_a)[0].lower().key() == DashInput(input_a)[0].lower().key()
+    assert DashInput(input_a)[0].key() != DashInput(input_a)[1].key()
+    assert DashInput(input_a)[0].key() != DashInput(input_b)[0].key()
+
+
+def test_interns_operations_built_the_same_way():
+    function = Mock(return_value="x")
+    a, b = data_provider(input_a)(function), data_provider(input_a)(function)
+
+    assert a is b
+    assert DashInput(input_a)['x'][0] is DashInput(input_a)['x'][0]
+    assert DashInput(input_a)[1] is not DashInput(input_a)[True]
+    assert DashInput(input_a)[1] is not DashInput(input_b)[1]
+
+    context = EvaluationContext({input_a: "a"})
+    assert [a.upper().evaluate(context), b.upper().evaluate(context)] == ["X", "X"]
+    function.assert_called_once_with("a")
+
+
+class _Prices:
+    def __init__(self, factor):
+        self.factor = factor
+
+    def scaled(self, value):
+        return value * self.factor
+
+    @classmethod
+    def unit(cls, value):
+        return value
+
+
+def test_keys_of_methods_identify_their_objects():
+    first, second = _Prices(1), _Prices(2)
+
+    assert data_provider(input_a)(first.scaled).key() != data_provider(input_a)(second.scaled).key()
+    assert data_provider(input_a)(first.scaled).key() == data_provider(input_a)(first.scaled).key()
+    assert data_provider(input_a)(_Prices.unit).key() == data_provider(input_a)(_Prices.unit).key()
+    assert data_provider(input_a)(len).key() == data_provider(input_a)(len).key()
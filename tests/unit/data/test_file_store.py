@@ -0,0 +1,108 @@
+import time
+
+import numpy
+import pandas
+import pytest
+from dash.dependencies import Input
+
+from simpledash.data.cache import MISSING
+from simpledash.data.data_providers import data_provider, EvaluationContext
+from simpledash.data.file_store import SharedFileStore
+
+input_a = Input('a', 'x')
+
+
+def test_shares_results_between_stores_using_the_same_directory(tmp_path):
+    calls = []
+
+    @data_provider(input_a)
+    def provider(a):
+        calls.append(a)
+        return {"value": a}
+
+    assert provider.evaluate(EvaluationContext({input_a: 1}, SharedFileStore(tmp_path, providers=[provider]))) \
+        == {"value": 1}
+    assert provider.evaluate(EvaluationContext({input_a: 1}, SharedFileStore(tmp_path, providers=[provider]))) \
+        == {"value": 1}
+    assert calls == [1]
+
+
+def test_stores_only_results_of_given_providers(tmp_path):
+    @data_provider(input_a)
+    def provider(a):
+        return {"value": a}
+
+    store = SharedFileStore(tmp_path)
+    store.keep_results_of([provider['value']])
+
+    assert provider['value'].evaluate(EvaluationContext({input_a: 1}, store)) == 1
+    assert len(list(tmp_path.iterdir())) == 1
+    assert store.stores(provider['value']) and not store.stores(provider)
+
+
+def test_separates_namespaces(tmp_path):
+    SharedFileStore(tmp_path, namespace='v1').put("key", "old")
+
+    assert SharedFileStore(tmp_path, namespace='v2').get("key") is MISSING
+    assert SharedFileStore(tmp_path, namespace='v1').get("key") == "old"
+
+
+def test_evicts_least_recently_used_results(tmp_path):
+    now = [1000.0]
+    store = SharedFileStore(tmp_path, max_entries=2, clock=lambda: now[0])
+    for key in "ab":
+        now[0] += 1
+        store.put(key, key)
+    now[0] += 1
+    assert store.get("a") == "a"
+
+    now[0] += 1
+    store.put("c", "c")
+
+    assert [store.get(key) for key in "abc"] == ["a", MISSING, "c"]
+
+
+def test_expires_old_results(tmp_path):
+    now = [time.time()]
+    store = SharedFileStore(tmp_path, ttl=10, clock=lambda: now[0])
+    store.put("key", "value")
+    assert store.get("key") == "value"
+
+    now[0] += 11
+    assert store.get("key") is MISSING
+
+
+def test_does_not_store_values_which_cannot_be_serialized(tmp_path):
+    store = SharedFileStore(tmp_path)
+    store.put("key", lambda: None)
+
+    assert store.get("key") is MISSING
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reads_numpy_arrays_through_memory_map(tmp_path):
+    store = SharedFileStore(tmp_path)
+    store.put("key", numpy.arange(10))
+
+    result = store.get("key")
+    assert isinstance(result, numpy.memmap)
+    assert result.tolist() == list(range(10))
+
+
+def test_stores_data_frames(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = SharedFileStore(tmp_path)
+    frame = pandas.DataFrame({"x": [1, 2, 3], "y": ["a", "b", "c"]}, index=[10, 20, 30])
+    store.put("key", frame)
+
+    assert list(tmp_path.glob("*.arrow"))
+    pandas.testing.assert_frame_equal(store.get("key"), frame)
+
+
+def test_returns_missing_for_unknown_keys(tmp_path):
+    store = SharedFileStore(tmp_path)
+    store.put("key", "value")
+    store.clear()
+
+    assert store.get("key") is MISSING
+    assert store.get("other") is MISSING
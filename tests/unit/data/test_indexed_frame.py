@@ -0,0 +1,65 @@
+import numpy
+import pandas
+import pytest
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import DashInput, StaticValueProvider
+from simpledash.data.indexed_frame import IndexedFrame, _IndexedSelection
+from simpledash.data.predicates import _FusedSelection
+
+area = Input('area', 'value')
+price = Input('price', 'value')
+
+random = numpy.random.RandomState(0)
+flats = pandas.DataFrame(dict(
+    area=numpy.where(random.rand(1000) < 0.05, numpy.nan, random.randint(10, 100, 1000).astype(float)),
+    rent_price=random.randint(500, 5000, 1000),
+    city=random.choice(["a", "b"], 1000)
+), index=random.permutation(1000) + 5000)
+
+
+def test_selects_ranges_with_indexes():
+    frame = IndexedFrame(flats)
+    area_range = DashInput(area)
+    selection = frame[frame['area'].between(area_range[0], area_range[1]) & (frame['rent_price'] < price)
+                      & (DashInput(area)[0] + 10 <= frame['area'])]
+
+    assert isinstance(selection._op, _IndexedSelection)
+    for area_value, price_value in [((20, 40), 3000), ((20.5, 20.5), 5000), ((50, 30), 3000), ((0, 1000), 499)]:
+        result = selection.evaluate({area: area_value, price: price_value})
+        expected = flats[flats['area'].between(*area_value) & (flats['rent_price'] < price_value)
+                         & (area_value[0] + 10 <= flats['area'])]
+        pandas.testing.assert_frame_equal(result, expected)
+
+
+def test_selects_single_open_range():
+    frame = IndexedFrame(flats, columns=['area'])
+    selection = frame[frame['area'] > DashInput(area)]
+
+    assert isinstance(selection._op, _IndexedSelection)
+    pandas.testing.assert_frame_equal(selection.evaluate({area: 50}), flats[flats['area'] > 50])
+
+
+def test_falls_back_to_scanning_for_other_masks():
+    frame = IndexedFrame(flats, columns=['area'])
+
+    assert type(frame[(frame['area'] > 50) | (frame['area'] < 20)]._op) is _FusedSelection
+    assert type(frame[(frame['area'] > 50) & (frame['rent_price'] < 1000)]._op) is _FusedSelection
+
+    selection = frame[frame['area'] > DashInput(area)]
+    pandas.testing.assert_frame_equal(selection.evaluate({area: numpy.nan}), flats[flats['area'] > numpy.nan])
+
+
+def test_indexes_only_numeric_columns():
+    assert set(IndexedFrame(flats)._indexes) == {'area', 'rent_price'}
+    with pytest.raises(ValueError):
+        IndexedFrame(flats, columns=['city'])
+
+
+def test_is_not_merged_with_static_value_of_the_same_frame():
+    frame, static = IndexedFrame(flats, columns=['area']), StaticValueProvider(flats)
+
+    assert frame['area'] is not static['area']
+    assert frame['area'].key() != static['area'].key()
+    assert isinstance(frame[frame['area'] > DashInput(area)]._op, _IndexedSelection)
+    assert type(static[static['area'] > DashInput(area)]._op) is _FusedSelection
@@ -0,0 +1,74 @@
+from dash.dependencies import Input
+from flask import Flask
+
+from simpledash.data.cache import ResultCache
+from simpledash.data.data_providers import data_provider, EvaluationContext, evaluate_all
+from simpledash.data.metrics import Metrics
+from simpledash.data.plan import EvaluationPlan
+
+input_a = Input('a', 'x')
+
+
+@data_provider(input_a)
+def flats(a):
+    return {"latitude": [a] * 10}
+
+
+def test_records_calls_of_data_providers():
+    metrics = Metrics()
+
+    for value in (1, 2):
+        evaluate_all([flats['latitude'], flats], EvaluationContext({input_a: value}, metrics=metrics))
+    EvaluationPlan([flats['latitude']], metrics).run({input_a: 3})
+
+    stats = {s['label']: s for s in metrics.snapshot().values()}
+    assert stats.keys() == {"flats", "flats['latitude']"}
+    assert stats["flats"]['calls'] == 3
+    assert stats["flats"]['total_seconds'] > 0
+    assert stats["flats"]['result_bytes'] > 0
+    assert set(stats["flats"]['quantiles'].keys()) == {0.5, 0.9, 0.99}
+
+
+def test_records_cache_hits_and_misses():
+    metrics = Metrics()
+    cache = ResultCache()
+
+    for value in (1, 1, 2):
+        flats.evaluate(EvaluationContext({input_a: value}, cache, metrics=metrics))
+
+    [stats] = metrics.snapshot().values()
+    assert (stats['calls'], stats['cache_hits'], stats['cache_misses']) == (2, 1, 2)
+
+
+def test_exposes_metrics_in_prometheus_format():
+    metrics = Metrics()
+    flats['latitude'].evaluate(EvaluationContext({input_a: 1}, metrics=metrics))
+    server = Flask(__name__)
+    metrics.register_route(server)
+
+    response = server.test_client().get('/metrics')
+
+    assert response.status_code == 200
+    text = response.get_data(as_text=True)
+    assert '# TYPE simpledash_provider_seconds summary' in text
+    key = flats['latitude'].key()
+    assert 'simpledash_provider_calls_total{{provider="flats[\'latitude\']",key="{}"}} 1'.format(key) in text
+    assert 'simpledash_provider_seconds{{provider="flats",key="{}",quantile="0.99"}}'.format(flats.key()) in text
+    assert 'simpledash_provider_seconds_count{{provider="flats",key="{}"}} 1'.format(flats.key()) in text
+
+
+def test_distinguishes_providers_with_the_same_label_in_prometheus_format():
+    def other_flats(a):
+        return {"latitude": [a]}
+    other_flats.__module__, other_flats.__qualname__ = 'other_module', 'flats'
+
+    metrics = Metrics()
+    for provider in (flats, data_provider(input_a)(other_flats)):
+        provider['latitude'].evaluate(EvaluationContext({input_a: 1}, metrics=metrics))
+
+    series = [line.rsplit(" ", 1)[0] for line in metrics.to_prometheus().splitlines() if not line.startswith("#")]
+
+    assert len(series) == len(set(series))
+    calls = [line for line in series
+             if line.startswith('simpledash_provider_calls_total{provider="flats[\'latitude\']"')]
+    assert len(calls) == 2
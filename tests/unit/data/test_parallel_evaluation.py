@@ -0,0 +1,49 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import data_provider, EvaluationContext, evaluate_all
+
+input_a = Input('a', 'x')
+
+
+def _slow_provider(name, *arguments):
+    @data_provider(*arguments)
+    def provider(*values):
+        time.sleep(0.2)
+        return [name] + [v for value in values for v in value]
+
+    return provider
+
+
+def test_evaluates_independent_data_providers_in_parallel():
+    lat, lng, colors = (_slow_provider(name, input_a) for name in ("lat", "lng", "colors"))
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        context = EvaluationContext({input_a: ["a"]}, executor=executor)
+        start = time.monotonic()
+        result = evaluate_all([lat, lng, colors[0]], context)
+
+    assert time.monotonic() - start < 0.35
+    assert result == [["lat", "a"], ["lng", "a"], "colors"]
+
+
+def test_evaluates_arguments_before_operations_without_deadlocking_the_pool():
+    threads = set()
+
+    @data_provider(input_a)
+    def base(a):
+        threads.add(threading.current_thread().name)
+        return a
+
+    left = _slow_provider("left", base)
+    right = _slow_provider("right", base)
+    top = _slow_provider("top", left, right)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = evaluate_all([top, left], EvaluationContext({input_a: ["a"]}, executor=executor))
+
+    assert result == [["top", "left", "a", "right", "a"], ["left", "a"]]
+    assert threads != {threading.current_thread().name}
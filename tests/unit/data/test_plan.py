@@ -0,0 +1,60 @@
+from unittest.mock import Mock
+
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import DashInput, data_provider, StaticValueProvider, DataProvider
+from simpledash.data.plan import EvaluationPlan
+
+input_a = Input('a', 'x')
+input_b = Input('b', 'x')
+
+
+def test_runs_plan_with_the_same_results_as_evaluation():
+    function = Mock(side_effect=lambda a, b, suffix: {"value": a + b + suffix})
+    shared = data_provider(input_a, DashInput(input_b)[0], suffix=StaticValueProvider("!"))(function)
+    providers = [shared["value"].upper(), shared["value"][DashInput(input_b)[1]], shared]
+    context = {input_a: "abc", input_b: ["d", -1]}
+
+    plan = EvaluationPlan(providers)
+
+    assert plan.run(context) == ["ABCD!", "!", {"value": "abcd!"}]
+    assert [provider.evaluate(context) for provider in providers] == ["ABCD!", "!", {"value": "abcd!"}]
+    assert function.call_count == 1 + 3
+
+
+def test_runs_very_deep_data_providers():
+    provider = DashInput(input_a)
+    for _ in range(10000):
+        provider = provider[0]
+
+    nested = "x"
+    for _ in range(10000):
+        nested = [nested]
+
+    assert EvaluationPlan([provider]).run({input_a: nested}) == ["x"]
+
+
+class _Twice(DataProvider):
+    def __init__(self, provider: DataProvider):
+        self._provider = provider
+
+    def depends_on(self):
+        return self._provider.depends_on()
+
+    def arguments(self):
+        return [self._provider]
+
+    def evaluate(self, context):
+        return self._provider.evaluate(context) * 2
+
+
+def test_evaluates_arguments_of_other_providers_only_once():
+    function = Mock(side_effect=lambda a: a)
+    shared = data_provider(input_a)(function)
+    twice = _Twice(shared)
+
+    plan = EvaluationPlan([twice, twice.upper(), _Twice(shared)])
+
+    assert len(plan) == 4  # without the shared provider
+    assert plan.run({input_a: "ab"}) == ["abab", "ABAB", "abab"]
+    assert function.call_count == 1
@@ -0,0 +1,57 @@
+import numpy
+import pandas
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import DashInput, StaticValueProvider, Operation
+from simpledash.data.predicates import _FusedSelection
+
+area = Input('area', 'value')
+price = Input('price', 'value')
+flats = pandas.DataFrame(dict(
+    area=[20.0, 35.5, numpy.nan, 80.0, 50.0],
+    rent_price=[1000, 1500, 2000, 3500, 2500],
+    district=pandas.Categorical(["a", "b", "a", "c", "b"], ordered=True)
+), index=[10, 11, 12, 13, 14])
+
+
+def test_fuses_column_predicates_into_single_selection():
+    frame = StaticValueProvider(flats)
+    selection = frame[frame['area'].between(DashInput(area)[0], DashInput(area)[1]) & (frame['rent_price'] < price)]
+
+    assert isinstance(selection._op, _FusedSelection)
+    assert selection._args[0] is frame
+    assert selection.depends_on() == {area, price}
+    result = selection.evaluate({area: (30, 80), price: 3000})
+    assert list(result.index) == [11, 14]
+
+
+def test_fused_selection_equals_pandas_selection():
+    frame = StaticValueProvider(flats)
+    masks = [
+        lambda f, low: ~(f['area'] * 2 > low) | (f['rent_price'] - f['area'] >= 1000),
+        lambda f, low: (f['area'] + 10 <= low) & (f['rent_price'] / 10 > 50),
+        lambda f, low: f['district'] > low,
+    ]
+    for mask in masks:
+        selection = frame[mask(frame, DashInput(area))]
+        low = "a" if mask is masks[-1] else 60
+        assert isinstance(selection._op, _FusedSelection)
+        pandas.testing.assert_frame_equal(selection.evaluate({area: low}), flats[mask(flats, low)])
+
+
+def test_structurally_equal_selections_have_equal_keys():
+    def selection(low):
+        frame = StaticValueProvider(flats)
+        return frame[frame['area'] > DashInput(area)[low]]
+
+    assert selection(0).key() == selection(0).key()
+    assert selection(0).key() != selection(1).key()
+
+
+def test_does_not_fuse_other_selections():
+    frame = StaticValueProvider(flats)
+
+    assert not isinstance(frame['area']._op, _FusedSelection)
+    assert isinstance(frame[DashInput(area)], Operation)
+    assert not isinstance(frame[DashInput(area) > 3]._op, _FusedSelection)
+    assert not isinstance(frame[frame['area'].isna()]._op, _FusedSelection)
@@ -0,0 +1,78 @@
+import os
+
+import numpy
+import pandas
+import pytest
+from dash.dependencies import Input
+
+from simpledash.data import process_pool
+from simpledash.data.data_providers import process_data_provider, DataProviderOperationException
+from simpledash.data.process_pool import warm_up_process_pool, shutdown_process_pool
+
+input_a = Input('a', 'x')
+
+
+@process_data_provider(input_a)
+def process_id(a):
+    return os.getpid(), a
+
+
+@process_data_provider(input_a)
+def doubled(frame):
+    return frame * 2
+
+
+@process_data_provider(input_a)
+def identity(value):
+    return value
+
+
+@process_data_provider(input_a)
+def warms_up_pool(a):
+    warm_up_process_pool()  # like setup_callbacks called by the module of the app imported again
+    return process_pool.in_worker_process()
+
+
+@pytest.fixture(autouse=True)
+def pool():
+    warm_up_process_pool(max_workers=1)
+    yield
+    shutdown_process_pool()
+
+
+def test_runs_data_provider_in_another_process():
+    pid, value = process_id.evaluate({input_a: "abc"})
+
+    assert pid != os.getpid()
+    assert value == "abc"
+
+
+def test_passes_large_data_frames_through_shared_memory(monkeypatch):
+    frame = pandas.DataFrame({
+        "x": numpy.arange(200000, dtype=float),
+        "y": pandas.Categorical(["a", "b"] * 100000),
+        "z": numpy.arange(200000)
+    }, index=numpy.arange(200000) + 10)
+    shared = []
+    share = process_pool._share
+    monkeypatch.setattr(process_pool, '_share', lambda v, blocks: share(v, shared))
+
+    result = doubled.evaluate({input_a: frame[["x", "z"]]})
+
+    assert len(shared) == 2
+    pandas.testing.assert_frame_equal(result, frame[["x", "z"]] * 2)
+    assert doubled.evaluate({input_a: frame["x"]}).equals(frame["x"] * 2)
+    pandas.testing.assert_frame_equal(identity.evaluate({input_a: frame}), frame)
+
+
+def test_requires_top_level_functions():
+    def local(a):
+        return a
+
+    with pytest.raises(DataProviderOperationException):
+        process_data_provider(input_a)(local)
+
+
+def test_does_not_start_pools_in_workers():
+    assert not process_pool.in_worker_process()
+    assert warms_up_pool.evaluate({input_a: None}) is True
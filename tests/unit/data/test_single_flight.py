@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from dash.dependencies import Input
+
+from simpledash.data.data_providers import data_provider, EvaluationContext
+from simpledash.data.single_flight import SingleFlight
+
+input_a = Input('a', 'x')
+
+
+def _wait_until_in_flight(single_flight: SingleFlight, started: threading.Event):
+    assert started.wait(5)
+    assert single_flight.in_flight() == 1
+
+
+def test_concurrent_calls_with_the_same_key_share_the_computation():
+    single_flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    compute = Mock(side_effect=lambda: started.set() or release.wait(5) and "result")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(single_flight.do, "key", compute)
+        _wait_until_in_flight(single_flight, started)
+        followers = [executor.submit(single_flight.do, "key", compute) for _ in range(3)]
+        release.set()
+        results = [future.result() for future in [leader] + followers]
+
+    assert results == ["result"] * 4
+    compute.assert_called_once_with()
+    assert single_flight.in_flight() == 0
+
+
+def test_followers_get_the_exception_of_the_computation():
+    single_flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(5)
+        raise ValueError("failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(single_flight.do, "key", compute)
+        _wait_until_in_flight(single_flight, started)
+        follower = executor.submit(single_flight.do, "key", Mock())
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert single_flight.in_flight() == 0
+
+
+def test_does_not_keep_results():
+    single_flight = SingleFlight()
+    compute = Mock(return_value=1)
+
+    single_flight.do("key", compute)
+    single_flight.do("key", compute)
+
+    assert compute.call_count == 2
+
+
+def test_evaluation_contexts_coalesce_on_input_values():
+    single_flight = SingleFlight()
+    function = Mock(side_effect=lambda a: a * 2)
+    provider = data_provider(input_a)(function)
+    calls = []
+    single_flight.do = Mock(side_effect=lambda key, compute: calls.append(key) or compute())
+
+    assert provider.evaluate(EvaluationContext({input_a: 1}, single_flight=single_flight)) == 2
+    assert provider.evaluate(EvaluationContext({input_a: 1}, single_flight=single_flight)) == 2
+    assert provider.evaluate(EvaluationContext({input_a: 2}, single_flight=single_flight)) == 4
+
+    assert calls[0] == calls[1] != calls[2]
@@ -1,4 +1,7 @@
-from simpledash.inspector.accessors import TupleAccessor, NestedAccessor, KeyAccessor, DummyAccessor, PropertyAccessor
+from unittest.mock import Mock
+
+from simpledash.inspector.accessors import TupleAccessor, NestedAccessor, KeyAccessor, DummyAccessor, \
+    PropertyAccessor, PathAccessor, set_all
 
 
 def test_key_accessor():
@@ -38,3 +41,53 @@ def test_nested_accessor_with_dummy():
 def test_dummy_accessor():
     accessor = DummyAccessor()
     assert accessor.set("a", "b") == "b"
+
+
+def test_accessor_path():
+    accessor = NestedAccessor.from_list([KeyAccessor('data'), TupleAccessor(1), DummyAccessor(), KeyAccessor('x')])
+    assert accessor.path() == ['data', 1, 'x']
+    assert DummyAccessor().path() == []
+
+
+def test_builds_flat_path_accessor_from_list():
+    accessor = NestedAccessor.from_list([PropertyAccessor('figure'), KeyAccessor('data'), TupleAccessor(1)])
+    figure = Mock(figure=dict(data=("a", "b")))
+
+    assert isinstance(accessor, PathAccessor)
+    assert not hasattr(accessor, '__dict__')
+    assert repr(accessor) == ".figure[data](1)"
+    assert accessor.get(figure) == "b"
+    assert accessor.set(figure, "B").figure == dict(data=("a", "B"))
+
+
+def test_copies_only_tuples_whose_items_are_replaced():
+    layout = Mock(children=(Mock(figure=None), "text"))
+    children = layout.children
+    accessor = NestedAccessor.from_list([PropertyAccessor('children'), TupleAccessor(0), PropertyAccessor('figure')])
+
+    assert accessor.set(layout, "F") is layout
+    assert layout.children is children
+    assert children[0].figure == "F"
+
+
+def test_sets_all_values_in_single_pass():
+    figure = dict(data=[dict(x=None, marker=(None, dict(color=None))), dict(y=None)], layout=None)
+    data = figure['data']
+    paths = [['data', 0, 'x'], ['data', 0, 'marker', 0], ['data', 0, 'marker', 1, 'color'], ['data', 1, 'y']]
+    accessors = [
+        NestedAccessor.from_list([TupleAccessor(key) if key in (0, 1) and 'marker' in path[:i] else KeyAccessor(key)
+                                  for i, key in enumerate(path)])
+        for path in paths
+    ]
+
+    result = set_all(figure, accessors, ["X", "M", "C", "Y"])
+
+    assert result == dict(data=[dict(x="X", marker=("M", dict(color="C"))), dict(y="Y")], layout=None)
+    assert result['data'] is data
+
+
+def test_sets_values_one_by_one_if_paths_overlap():
+    accessors = [KeyAccessor('data'), NestedAccessor.from_list([KeyAccessor('data'), KeyAccessor(0)])]
+
+    assert set_all(dict(data=None), accessors, [[1, 2], 3]) == dict(data=[3, 2])
+    assert set_all(dict(data=[0]), accessors[::-1] + [DummyAccessor()], [1, [1, 2], "all"]) == "all"
@@ -0,0 +1,83 @@
+import json
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+import pandas
+from dash.dependencies import Input
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.data.data_providers import data_provider, DashInput
+from simpledash.inspector.graph import provider_graph
+
+flats = pandas.DataFrame(dict(area=[30, 50], rent_price=[1000, 2000], is_available=[True, False]))
+
+
+@data_provider(Input('type_filter', 'value'))
+def flats_by_availability(required_availability):
+    return flats if required_availability == 'All' else flats[flats['is_available']]
+
+
+def _estate_layout():
+    area_range = DashInput(Input('area-filter', 'value'))
+    flats_to_display = flats_by_availability[flats_by_availability['area'].between(area_range[0], area_range[1])]
+    return html.Div([
+        dcc.Dropdown(id='type_filter', options=[dict(label=v, value=v) for v in ['All', 'Available']], value='All'),
+        dcc.RangeSlider(id='area-filter', min=flats_by_availability['area'].min(),
+                        max=flats_by_availability['area'].max()),
+        dcc.Graph(id='relation-plot', figure=dict(data=[dict(x=flats_to_display['area'],
+                                                             y=flats_to_display['rent_price'])])),
+    ])
+
+
+def test_reports_providers_recomputed_by_callbacks_fired_by_the_same_input():
+    app = Mock()
+    setup_callbacks(app, _estate_layout())
+
+    graph = provider_graph(app)
+    redundant = graph.redundant()
+
+    assert redundant[0]['label'] == 'flats_by_availability'
+    assert redundant[0]['input'] == 'type_filter.value'
+    assert redundant[0]['evaluations'] == 3
+    assert {r['label'] for r in redundant} == {'flats_by_availability', "flats_by_availability['area']"}
+
+
+def test_follows_outputs_used_as_inputs_of_other_callbacks():
+    app = Mock()
+    layout = html.Div([
+        dcc.Input(id='text', value=DashInput(Input('source', 'value')).upper()),
+        dcc.Graph(id='graph', figure=dict(title=DashInput(Input('text', 'value')).lower())),
+    ])
+    setup_callbacks(app, layout)
+
+    report = json.loads(provider_graph(app).to_json())
+
+    assert report['inputs'][0] == dict(input='source.value', callbacks=['callback-0', 'callback-1'],
+                                       outputs=['text.value', 'graph.figure'])
+    assert [c['outputs'] for c in report['callbacks']] == [['text.value'], ['graph.figure']]
+    assert report['redundant'] == []
+
+
+def test_grouped_callbacks_compute_shared_providers_once():
+    app = Mock()
+    setup_callbacks(app, _estate_layout(), group_callbacks=True)
+
+    report = provider_graph(app).as_dict()
+    shared = [p for p in report['providers'] if p['label'] == 'flats_by_availability'][0]
+
+    assert shared['evaluations'] == {'type_filter.value': 1, 'area-filter.value': 1}
+    assert set(shared['outputs']) == {'area-filter.min', 'area-filter.max', 'relation-plot.figure'}
+    assert report['redundant'] == []
+
+
+def test_exports_graph_to_dot():
+    app = Mock()
+    setup_callbacks(app, _estate_layout())
+
+    dot = provider_graph(app).to_dot()
+
+    assert dot.startswith("digraph providers {")
+    assert '"type_filter.value" [label="type_filter.value", shape=ellipse' in dot
+    assert 'label="flats_by_availability\\n3x per change of type_filter.value", color=red' in dot
+    assert '"relation-plot.figure" [label="relation-plot.figure\\ncallback-2", shape=note];' in dot
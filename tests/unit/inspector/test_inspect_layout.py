@@ -25,3 +25,20 @@ def test_find_all_components():
 
 def _get_ids(components):
     return set(c.id for c in components)
+
+
+def test_finds_components_nested_in_other_properties():
+    option = html.Strong("Option", id='option')
+    checklist = dcc.Checklist(id='checklist')
+    checklist.options = [{'label': option, 'value': 'x'}]  # component labels are accepted only by newer dash
+    div = html.Div([html.Div(id='content'), checklist], id='div')
+
+    assert [c.id for c in find_all_components(div)] == ['content', 'option', 'checklist', 'div']
+
+
+def test_finds_components_in_very_deep_layouts():
+    layout = html.Div(id='leaf')
+    for i in range(5000):
+        layout = html.Div([layout], id=str(i))
+
+    assert len(list(find_all_components(layout))) == 5001
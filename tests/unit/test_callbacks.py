@@ -1,12 +1,17 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from unittest import mock
 from unittest.mock import Mock
 
+import dash
 import dash_core_components as dcc
+import dash_html_components as html
 from dash.dependencies import Input, Output, State
 
-from simpledash.callbacks import _replace_data_providers_with_nones, _setup_callback
-from simpledash.data.data_providers import DataProvider, DashInput
+from simpledash.callbacks import _replace_data_providers_with_nones, _setup_callback, setup_callbacks, _Settings
+from simpledash.data.data_providers import DataProvider, DashInput, data_provider
 from simpledash.inspector.accessors import NestedAccessor, Accessor, KeyAccessor, DummyAccessor
 from simpledash.inspector.component import DataProviderWithAccessor
 
@@ -49,6 +54,115 @@ def test_sets_up_callbacks_properly():
     assert result == dict(series=[{"x": "X", "y": "Y", "z": "z"}])
 
 
+def test_evaluates_shared_data_provider_once_per_callback():
+    app = Mock()
+    function = Mock(return_value=dict(x="X", y="Y"))
+    shared = data_provider(Input("x", "z"))(function)
+
+    _setup_callback(app, test_component, 'figure', [
+        _data_provider_with_accessor([KeyAccessor('series'), KeyAccessor(0), KeyAccessor("x")], shared['x']),
+        _data_provider_with_accessor([KeyAccessor('series'), KeyAccessor(0), KeyAccessor("y")], shared['y'])
+    ])
+
+    method = app.mock_calls[1][1][0]
+    result = method("x", dict(series=[{"x": "x", "y": "y"}]))
+
+    assert result == dict(series=[{"x": "X", "y": "Y"}])
+    function.assert_called_once_with("x")
+
+
+def test_groups_callbacks_sharing_data_providers():
+    app = Mock()
+    function = Mock(side_effect=lambda v: dict(x=v, y=v.upper()))
+    shared = data_provider(Input("chooser", "value"))(function)
+    layout = html.Div([
+        dcc.Graph(id='graph-1', figure=dict(x=shared['x'])),
+        dcc.Graph(id='graph-2', figure=dict(y=shared['y'])),
+        html.Div(Input("chooser", "value"), id='unrelated'),
+        dcc.Input(id='circular', value=shared['x']),
+        html.Div(shared['y'][Input("circular", "value")], id='depends-on-circular')
+    ], id='layout')
+
+    setup_callbacks(app, layout, group_callbacks=True)
+
+    callbacks = [c for c in app.mock_calls if c[0] == 'callback']
+    assert len(callbacks) == 3
+    app.callback.assert_any_call(
+        Output('depends-on-circular', 'children'),
+        [Input("chooser", "value"), Input("circular", "value")],
+        [State('depends-on-circular', 'children')]
+    )
+    app.callback.assert_any_call(
+        [Output('graph-1', 'figure'), Output('graph-2', 'figure'), Output('circular', 'value')],
+        [Input("chooser", "value")],
+        [State('graph-1', 'figure'), State('graph-2', 'figure'), State('circular', 'value')]
+    )
+
+    grouped_callback = next(c for c in callbacks if isinstance(c[1][0], list))
+    method = app.mock_calls[app.mock_calls.index(grouped_callback) + 1][1][0]
+    result = method("abc", dict(x=None), dict(y=None), None)
+
+    assert result == [dict(x="abc"), dict(y="ABC"), "abc"]
+    function.assert_called_once_with("abc")
+
+
+def test_does_not_group_targets_circular_through_other_callbacks():
+    app = Mock()
+    shared = DashInput(Input('x', 'value')).strip()
+    layout = html.Div([
+        dcc.Input(id='x'),
+        dcc.Input(id='a', value=shared.upper()),
+        dcc.Input(id='c', value=DashInput(Input('a', 'value')).lower()),
+        html.Div(shared + DashInput(Input('c', 'value')), id='b')
+    ])
+
+    setup_callbacks(app, layout, group_callbacks=True)
+
+    outputs = [c[1][0] for c in app.callback.mock_calls if len(c[1]) == 3]
+    assert sorted(outputs, key=repr) == sorted([Output('a', 'value'), Output('c', 'value'), Output('b', 'children')],
+                                               key=repr)
+
+
+def test_evaluates_only_data_providers_affected_by_triggered_inputs():
+    app = Mock()
+    x_function = Mock(return_value="X")
+    y_function = Mock(return_value="Y")
+
+    _setup_callback(app, test_component, 'figure', [
+        _data_provider_with_accessor([KeyAccessor('series'), KeyAccessor(0), KeyAccessor("x")],
+                                     data_provider(Input("x", "z"))(x_function)),
+        _data_provider_with_accessor([KeyAccessor('series'), KeyAccessor(0), KeyAccessor("y")],
+                                     data_provider(Input("y", "z"))(y_function))
+    ])
+    method = app.mock_calls[1][1][0]
+
+    with mock.patch('simpledash.callbacks._triggered_inputs', return_value={Input("y", "z")}):
+        result = method("x", "y", dict(series=[{"x": "old X", "y": "old Y"}]))
+
+    assert result == dict(series=[{"x": "old X", "y": "Y"}])
+    x_function.assert_not_called()
+
+    with mock.patch('simpledash.callbacks._triggered_inputs', return_value={Input("other", "z")}):
+        assert method("x", "y", dict(series=[{"x": "old X", "y": "old Y"}])) is dash.no_update
+
+
+def test_sends_only_values_of_data_providers_with_partial_updates():
+    app = Mock()
+
+    _setup_callback(app, test_component, 'figure', [_x_provider(), _y_provider()],
+                    settings=_Settings(partial_updates=True))
+
+    app.callback.assert_called_with(Output('test', 'figure'), [Input("x", "z"), Input("y", "z")], [])
+
+    method = app.mock_calls[1][1][0]
+    with mock.patch('simpledash.callbacks._triggered_inputs', return_value={Input("y", "z")}):
+        result = method("X", "Y")
+
+    assert result.to_plotly_json()['operations'] == [
+        {'operation': 'Assign', 'location': ['series', 0, 'y'], 'params': {'value': "Y"}}
+    ]
+
+
 def _x_provider():
     return _data_provider_with_accessor(
         [KeyAccessor('series'), KeyAccessor(0), KeyAccessor("x")],
@@ -65,3 +179,89 @@ def _y_provider():
 
 def _data_provider_with_accessor(accessors: List[Accessor], data_provider: DataProvider):
     return DataProviderWithAccessor(data_provider, NestedAccessor.from_list(accessors))
+
+
+def test_coalesces_concurrent_requests_with_single_flight():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return value.upper()
+
+    app = dash.Dash(__name__)
+    app.layout = html.Div([
+        dcc.Input(id='text', value='a'),
+        html.Div(data_provider(Input('text', 'value'))(slow), id='output')
+    ])
+    setup_callbacks(app, single_flight=True)
+    request = {
+        "output": "output.children", "outputs": {"id": "output", "property": "children"},
+        "inputs": [{"id": "text", "property": "value", "value": "abc"}], "changedPropIds": ["text.value"],
+        "state": [{"id": "output", "property": "children", "value": None}]
+    }
+
+    def post():
+        return app.server.test_client().post('/_dash-update-component', json=request)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(post)
+        assert started.wait(5)
+        followers = [executor.submit(post) for _ in range(3)]
+        time.sleep(0.2)  # let the followers reach the in-flight computation
+        release.set()
+        responses = [future.result() for future in [leader] + followers]
+
+    assert [response.get_json()['response'] for response in responses] == [{'output': {'children': 'ABC'}}] * 4
+    assert calls == ["abc"]
+
+
+def test_puts_values_for_initial_inputs_into_layout():
+    app = Mock()
+    function = Mock(side_effect=lambda v: v.upper())
+    upper = data_provider(Input('text', 'value'))(function)
+    layout = html.Div([
+        dcc.Location(id='url'),
+        dcc.Input(id='text', value='abc'),
+        dcc.Input(id='upper', value=upper),
+        html.Div([upper, Input('upper', 'value')], id='both'),
+        html.Div(Input('url', 'pathname'), id='page'),
+        dcc.Graph(id='graph', figure=dict(title=Input('text', 'value'), data=[])),
+        html.Div(Input('page', 'children'), id='depends-on-page')
+    ])
+
+    setup_callbacks(app, layout, precompute_initial_values=True)
+
+    assert layout['upper'].value == "ABC"
+    assert layout['both'].children == ["ABC", "ABC"]
+    assert layout['graph'].figure == dict(title='abc', data=[])
+    assert not hasattr(layout['page'], 'children')
+    function.assert_called_once_with('abc')
+
+    assert {call[1][0].component_id for call in app.callback.mock_calls if len(call[1]) == 3} == \
+        {'upper', 'both', 'page', 'graph', 'depends-on-page'}
+    assert {call[1][0].component_id for call in app.callback.mock_calls
+            if call[2] == dict(prevent_initial_call=True)} == {'upper', 'both', 'graph'}
+
+
+def test_does_not_put_values_for_inputs_missing_in_layout_into_layout():
+    app = Mock()
+    function = Mock(side_effect=lambda clicks, tab: "{} {}".format(clicks, tab))
+    label = data_provider(Input('button', 'n_clicks'), Input('tabs', 'value'))(function)
+    layout = html.Div([
+        html.Button(id='button'),
+        dcc.Tabs(id='tabs', children=[dcc.Tab(label='A'), dcc.Tab(label='B')]),
+        html.Div(label, id='label'),
+        html.Div(Input('button', 'n_clicks'), id='clicks'),
+        html.Div(Input('button', 'id'), id='button-id')
+    ])
+
+    setup_callbacks(app, layout, precompute_initial_values=True)
+
+    assert not hasattr(layout['label'], 'children')
+    function.assert_not_called()
+    assert layout['button-id'].children == 'button'
+    assert {call[1][0].component_id for call in app.callback.mock_calls
+            if call[2] == dict(prevent_initial_call=True)} == {'button-id'}
@@ -0,0 +1,55 @@
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import Input, Output, State
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.callbacks.clientside import to_javascript
+from simpledash.data.data_providers import DashInput, data_provider
+from simpledash.inspector.accessors import KeyAccessor, NestedAccessor, DummyAccessor
+from simpledash.inspector.component import DataProviderWithAccessor
+
+input_a = Input("a", "value")
+input_b = Input("b", "value")
+
+
+def test_translates_item_access_to_javascript():
+    javascript = to_javascript([
+        DataProviderWithAccessor(DashInput(input_a)['points'][-1]['customdata'],
+                                 NestedAccessor(KeyAccessor('data'), KeyAccessor(0))),
+        DataProviderWithAccessor(DashInput(input_b)[0], KeyAccessor('title'))
+    ], [input_a, input_b])
+
+    assert javascript.startswith("function (input_0, input_1, current) {")
+    assert 'result = assign(result, ["data", 0], item(item(item(input_0, "points"), -1), "customdata"));' \
+           in javascript
+    assert 'result = assign(result, ["title"], item(input_1, 0));' in javascript
+
+
+def test_does_not_translate_data_providers_calling_functions():
+    assert to_javascript([DataProviderWithAccessor(DashInput(input_a).upper(), DummyAccessor())], [input_a]) is None
+    assert to_javascript([DataProviderWithAccessor(data_provider(input_a)(str), DummyAccessor())], [input_a]) is None
+
+
+def test_does_not_translate_attributes_and_keys_which_are_not_constant_strings_or_integers():
+    for provider in [DashInput(input_a).customdata, DashInput(input_a)[DashInput(input_b)],
+                     DashInput(input_a)[1.0], DashInput(input_a)[True], DashInput(input_a)[(0, 1)]]:
+        assert to_javascript([DataProviderWithAccessor(provider, DummyAccessor())], [input_a, input_b]) is None
+
+
+def test_sets_up_clientside_callbacks_for_trivial_data_providers():
+    app = Mock()
+    layout = html.Div([
+        dcc.Input(id='a'),
+        html.Div(input_a, id='passthrough'),
+        html.Div(DashInput(input_a).upper(), id='uppercase')
+    ], id='layout')
+
+    setup_callbacks(app, layout, clientside=True)
+
+    app.clientside_callback.assert_called_once()
+    assert app.clientside_callback.call_args[0][1:] == (
+        Output('passthrough', 'children'), [input_a], [State('passthrough', 'children')]
+    )
+    app.callback.assert_called_once_with(Output('uppercase', 'children'), [input_a], [State('uppercase', 'children')])
@@ -0,0 +1,134 @@
+from unittest import mock
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+import numpy
+import pandas
+import pytest
+from dash.dependencies import Input
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.callbacks.downsampling import Downsampling, lttb_indices, bucket_indices
+from simpledash.data.data_providers import data_provider
+
+
+def test_lttb_keeps_first_last_and_peaks():
+    x = numpy.arange(1000.0)
+    y = numpy.zeros(1000)
+    y[500] = 10.0
+
+    indices = lttb_indices(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert 500 in indices
+    assert (numpy.diff(indices) > 0).all()
+
+
+def test_bucket_keeps_one_point_per_occupied_cell():
+    x = numpy.array([0.0, 0.01, 0.02, 5.0, 10.0, numpy.nan])
+    y = numpy.array([0.0, 0.01, 0.02, 5.0, 10.0, 1.0])
+
+    assert list(bucket_indices(x, y, 4)) == [0, 3]
+    assert list(bucket_indices(x, y, 9)) == [0, 3, 4]
+
+
+def test_reduces_all_per_point_values_of_the_trace():
+    downsampling = Downsampling(max_points=10, strategy='bucket')
+    frame = pandas.DataFrame(dict(lat=numpy.linspace(0, 1, 100), lon=numpy.linspace(0, 1, 100)),
+                             index=numpy.arange(100, 200))
+
+    lat, lon, customdata, color, title = downsampling.apply(
+        [['data', 0, 'lat'], ['data', 0, 'lon'], ['data', 0, 'customdata'], ['data', 0, 'marker', 'color'],
+         ['layout', 'title']],
+        [frame['lat'], frame['lon'], frame.index, list(range(100)), "title"]
+    )
+
+    assert len(lat) == len(lon) == len(customdata) == len(color) <= 10
+    assert list(customdata) == list(lat.index)
+    assert color == [i - 100 for i in customdata]
+    assert title == "title"
+
+
+def test_leaves_small_traces_untouched():
+    x, y = [1, 2, 3], numpy.array([3, 2, 1])
+
+    assert Downsampling(max_points=3).apply([['data', 0, 'x'], ['data', 0, 'y']], [x, y]) == [x, y]
+
+
+def test_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        Downsampling(strategy='random')
+
+
+def test_callbacks_downsample_figures():
+    app = Mock()
+    frame = data_provider(Input('chooser', 'value'))(lambda value: pandas.DataFrame(dict(x=numpy.arange(100) * value)))
+    layout = html.Div(dcc.Graph(id='graph', figure=dict(data=[
+        dict(x=frame['x'], y=frame['x'], customdata=frame.index)
+    ])))
+
+    setup_callbacks(app, layout, downsampling=Downsampling(max_points=20))
+
+    method = app.mock_calls[1][1][0]
+    trace = method(2, dict(data=[dict(x=None, y=None, customdata=None)]))['data'][0]
+
+    assert len(trace['x']) == 20
+    assert list(trace['x']) == [2 * i for i in trace['customdata']]
+
+
+@pytest.mark.parametrize('partial_updates', [False, True])
+@pytest.mark.parametrize('changed', ['x-chooser', 'color-chooser'])
+def test_reduces_whole_trace_when_only_some_of_its_values_change(changed, partial_updates):
+    app = Mock()
+    frame = pandas.DataFrame(dict(a=numpy.random.RandomState(0).rand(100), b=numpy.arange(100.0)),
+                             index=numpy.arange(100, 200))
+    flats = data_provider()(lambda: frame)
+    layout = html.Div(dcc.Graph(id='graph', figure=dict(data=[dict(
+        x=flats[Input('x-chooser', 'value')], y=flats['b'], customdata=flats.index,
+        marker=dict(color=flats[Input('color-chooser', 'value')])
+    )])))
+    setup_callbacks(app, layout, downsampling=Downsampling(max_points=10, strategy='bucket'),
+                    partial_updates=partial_updates)
+    method = app.mock_calls[1][1][0]
+    figure = dict(data=[dict(x=None, y=None, customdata=None, marker=dict(color=None))])
+
+    with mock.patch('simpledash.callbacks._triggered_inputs', return_value={Input(changed, 'value')}):
+        inputs = app.callback.call_args[0][1]
+        values = dict(zip([Input('x-chooser', 'value'), Input('color-chooser', 'value')], ['a', 'b']))
+        result = method(*[values[inp] for inp in inputs], *([] if partial_updates else [figure]))
+
+    if partial_updates:
+        for operation in result.to_plotly_json()['operations']:
+            target = figure
+            for key in operation['location'][:-1]:
+                target = target[key]
+            target[operation['location'][-1]] = operation['params']['value']
+        result = figure
+    trace = result['data'][0]
+    assert len(trace['x']) == len(trace['y']) == len(trace['customdata']) == len(trace['marker']['color']) <= 10
+    assert list(trace['y']) == [i - 100 for i in trace['customdata']]
+    assert list(trace['x']) == list(frame['a'].loc[list(trace['customdata'])])
+    assert list(trace['marker']['color']) == list(frame['b'].loc[list(trace['customdata'])])
+
+
+def test_does_not_reduce_traces_with_per_point_values_given_in_layout():
+    app = Mock()
+    values = data_provider(Input('chooser', 'value'))(lambda value: numpy.arange(1000.0) * value)
+    layout = html.Div(dcc.Graph(id='graph', figure=dict(data=[
+        dict(x=list(range(1000)), y=values),
+        dict(x=values, y=values, customdata=list(range(1000))),
+        dict(x=values, y=values, marker=dict(colorscale=[[0, 'red'], [1, 'blue']]))
+    ])))
+
+    setup_callbacks(app, layout, downsampling=Downsampling(max_points=20))
+
+    method = app.mock_calls[1][1][0]
+    static_x, static_customdata, reduced = method(2, dict(data=[dict(x=list(range(1000)), y=None),
+                                                                 dict(x=None, y=None, customdata=list(range(1000))),
+                                                                 dict(x=None, y=None)]))['data']
+
+    assert len(static_x['x']) == len(static_x['y']) == 1000
+    assert len(static_customdata['x']) == len(static_customdata['y']) == len(static_customdata['customdata']) == 1000
+    assert len(reduced['x']) == len(reduced['y']) == 20
@@ -0,0 +1,66 @@
+import json
+from unittest import mock
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import Input
+from plotly.utils import PlotlyJSONEncoder
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.callbacks.layouts import LayoutCache, SerializedLayout
+from simpledash.data.data_providers import data_provider
+
+page_layout = html.Div([dcc.Input(id='page-input', value=3), html.Div([html.Span("a"), "b"])], id='page')
+
+
+def test_serialized_layout_encodes_to_the_same_json():
+    serialized = SerializedLayout(page_layout)
+
+    assert json.dumps(serialized, cls=PlotlyJSONEncoder) == json.dumps(page_layout, cls=PlotlyJSONEncoder)
+
+
+def test_serializes_the_same_layout_once():
+    cache = LayoutCache()
+
+    with mock.patch('simpledash.callbacks.layouts.SerializedLayout', wraps=SerializedLayout) as serialize:
+        first = cache.serialized(page_layout)
+        second = cache.serialized(page_layout)
+
+    assert first is second
+    serialize.assert_called_once_with(page_layout)
+
+
+def test_passes_values_other_than_components_through():
+    cache = LayoutCache()
+    value = dict(x=[1, 2])
+
+    assert cache.serialized(value) is value
+    assert cache.serialized(["a", "b"]) == ["a", "b"]
+    assert isinstance(cache.serialized([html.Span("a"), "b"]), SerializedLayout)
+
+
+def test_keeps_at_most_max_entries():
+    cache = LayoutCache(max_entries=2)
+    layouts = [html.Div(str(i)) for i in range(3)]
+
+    for layout in layouts:
+        cache.serialized(layout)
+
+    assert len(cache._entries) == 2
+    assert cache.serialized(layouts[2]) is cache.serialized(layouts[2])
+
+
+def test_callbacks_return_serialized_layouts_with_cache_layouts():
+    app = Mock()
+    current_page = data_provider(Input('url', 'pathname'))(lambda pathname: page_layout)
+    layout = html.Div(current_page, id='content')
+
+    setup_callbacks(app, layout, cache_layouts=True)
+
+    method = app.mock_calls[1][1][0]
+    result = method('/page', None)
+
+    assert isinstance(result, SerializedLayout)
+    assert result.layout is page_layout
+    assert method('/page', None) is result
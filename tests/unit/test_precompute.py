@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+import pytest
+from dash.dependencies import Input
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.callbacks.precompute import finite_inputs, precompute
+from simpledash.data.cache import ResultCache
+from simpledash.data.data_providers import data_provider, EvaluationContext
+
+availability = Input('availability', 'value')
+column = Input('column', 'value')
+limit = Input('limit', 'value')
+
+layout = html.Div([
+    dcc.Dropdown(id='availability', options=[dict(label="All", value="all"), dict(label="Free", value="free")],
+                 value="all", clearable=False),
+    dcc.RadioItems(id='column', options=["area", "price"], value="area"),
+    dcc.Dropdown(id='many', options={"a": "A"}, multi=True),
+    dcc.Dropdown(id='clearable', options={"a": "A", "b": "B"}),
+    dcc.Input(id='limit', value=3)
+])
+
+
+def test_finds_values_of_inputs_with_fixed_options():
+    assert finite_inputs(layout) == {
+        availability: ["all", "free"],
+        column: ["area", "price"],
+        Input('clearable', 'value'): ["a", "b", None]
+    }
+
+
+def test_evaluates_finite_parts_of_providers_for_all_combinations():
+    function = Mock(side_effect=lambda a, c: "{} {}".format(a, c))
+    finite = data_provider(availability, column)(function)
+    limited = data_provider(finite, limit)(lambda value, n: value[:n])
+    store = ResultCache()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert precompute([limited, finite.upper()], finite_inputs(layout), store, executor) == 4
+
+    assert function.call_count == 4
+    context = EvaluationContext({availability: "free", column: "price", limit: 4}, store)
+    assert limited.evaluate(context) == "free"
+    assert function.call_count == 4
+
+
+def test_skips_providers_with_too_many_combinations():
+    function = Mock(return_value=1)
+    provider = data_provider(availability, column)(function)
+
+    assert precompute([provider], finite_inputs(layout), ResultCache(), max_combinations=3) == 0
+    function.assert_not_called()
+
+
+def test_requires_cache():
+    with pytest.raises(ValueError):
+        setup_callbacks(Mock(), layout, precompute_finite_inputs=True)
@@ -0,0 +1,58 @@
+import base64
+from unittest.mock import Mock
+
+import dash_core_components as dcc
+import dash_html_components as html
+import numpy
+import pandas
+from dash.dependencies import Input
+
+from simpledash.callbacks import setup_callbacks
+from simpledash.callbacks.typed_arrays import to_typed_array
+from simpledash.data.data_providers import data_provider
+
+
+def test_encodes_float_series_as_typed_array():
+    spec = to_typed_array(pandas.Series([1.5, numpy.nan, -2.0]))
+
+    assert spec['dtype'] == 'f8'
+    decoded = numpy.frombuffer(base64.b64decode(spec['bdata']), dtype='<f8')
+    numpy.testing.assert_array_equal(decoded, [1.5, numpy.nan, -2.0])
+
+
+def test_narrows_64_bit_integers():
+    assert to_typed_array(numpy.array([1, 100], dtype='int64'))['dtype'] == 'i1'
+    assert to_typed_array(pandas.Index([0, 70000]))['dtype'] == 'i4'
+    assert to_typed_array(numpy.array([0, 2 ** 40], dtype='uint64'))['dtype'] == 'f8'
+
+
+def test_encodes_shape_of_two_dimensional_arrays():
+    spec = to_typed_array(numpy.zeros((2, 3), dtype='float32'))
+
+    assert spec['dtype'] == 'f4'
+    assert spec['shape'] == "2,3"
+
+
+def test_leaves_other_values_untouched():
+    strings = pandas.Series(["a", "b"])
+    nullable = pandas.Series([1, None], dtype='Int64')
+
+    assert to_typed_array(strings) is strings
+    assert to_typed_array(nullable) is nullable
+    assert to_typed_array(numpy.array([True, False])).dtype == bool
+    assert to_typed_array([1, 2]) == [1, 2]
+    assert to_typed_array(numpy.array([])).size == 0
+
+
+def test_callbacks_send_typed_arrays_in_figures():
+    app = Mock()
+    values = data_provider(Input('chooser', 'value'))(lambda value: pandas.Series([1.0, 2.0]) * value)
+    layout = html.Div(dcc.Graph(id='graph', figure=dict(data=[dict(x=values, y=[1, 2])])))
+
+    setup_callbacks(app, layout, typed_arrays=True)
+
+    method = app.mock_calls[1][1][0]
+    result = method(2, dict(data=[dict(x=None, y=[1, 2])]))
+
+    assert result['data'][0]['x'] == to_typed_array(numpy.array([2.0, 4.0]))
+    assert result['data'][0]['y'] == [1, 2]